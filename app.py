@@ -3,23 +3,29 @@
 import streamlit as st
 import pandas as pd
 import copy
+import random
 import io
 import contextlib
 import torch
-from torch.utils.data import TensorDataset, DataLoader
+import numpy as np
 
 # Importações do seu projeto
 from src.sim.simulator import Simulator
 from src.sim.machine import create_random_machines
-from src.nn.rede_neural import model, train
+from src.nn.rede_neural import MachinePredictor, train_fast
+from src.nn.registry import ModelRegistry
 from src.sim.logger import (
     plot_profit,
     plot_machine_performance,
     plot_vpl,
     plot_vpl_comparativo,
     save_logs,
-    save_machines_csv
+    save_machines_csv,
+    calculate_vpl
 )
+from src.sim.profiling import Profiler
+from src.sim.checkpoint import restore
+from src.config import PLOT_MAX_POINTS, DEFAULT_CONFIG
 
 # ======================== Configuração da Página ========================
 st.set_page_config(
@@ -44,70 +50,184 @@ num_days = st.sidebar.slider(
     value=5*365,            # Padrão de 5 anos
     step=365
 )
+seed = st.sidebar.number_input("Semente aleatória", min_value=0, value=42, step=1)
+profile_sim = st.sidebar.checkbox("Medir desempenho por fase (profiling)", value=False)
 run_sim = st.sidebar.button("🚀 Iniciar Simulação Completa")
-st.sidebar.info("A simulação inclui coleta de dados, treinamento da IA e a execução comparativa. Pode levar alguns instantes.")
+# Qualquer clique reexecuta o script, o que interrompe a simulação em andamento;
+# o resultado parcial guardado em session_state é exibido em seguida.
+st.sidebar.button("⏹️ Cancelar")
+st.sidebar.info("A simulação inclui coleta de dados, treinamento da IA e a execução comparativa. "
+                "Os resultados aparecem enquanto ela roda; use Cancelar para parar e ver o parcial.")
 
-# ======================== Função de Simulação em Cache ==========================
-# NOVO: Usamos o cache para não re-executar a simulação inteira a cada interação
-@st.cache_data
-def run_full_simulation(simulation_days):
+STREAM_CHUNK_DAYS = 30 # Dias simulados entre duas atualizações da tela
+MAX_SNAPSHOTS = 4 # Prefixos já simulados guardados por semente (ficam os mais longos)
+
+# ======================== Pipeline da Simulação ==========================
+def prepare_model(seed, initial_machines):
     """
-    Executa todo o pipeline: coleta, treino e simulação comparativa.
+    Fases 1 e 2: coleta de dados e treino da RN (ou modelo do cache em disco).
+    O modelo é criado depois de semear o torch, então a mesma semente gera
+    os mesmos pesos. Retorna (modelo, log de treino).
     """
-    # Cria um conjunto único de máquinas para garantir uma comparação justa
-    initial_machines = create_random_machines()
-    
+    torch.manual_seed(seed)
+    model = MachinePredictor()
+
+    # Modelo já treinado para este cenário + semente? Pula as fases 1 e 2.
+    registry = ModelRegistry()
+    cache_key = registry.key(seed, DEFAULT_CONFIG, collect_days=365, epochs=50, trainer="train_fast")
+    cached = registry.load(cache_key, model)
+    if cached is not None:
+        status_log.text("Fases 1-2/3: Modelo treinado carregado do cache...")
+        return model, cached[3].get("training_log", "") + "\n(Modelo carregado do cache em disco.)"
+
     # --- FASE 1: Coleta de Dados ---
     status_log.text("Fase 1/3: Coletando dados para a IA (365 dias)...")
-    data_collector = Simulator(machines=copy.deepcopy(initial_machines), use_ai=False)
+    data_collector = Simulator(machines=copy.deepcopy(initial_machines), use_ai=False, seed=[seed, 0])
     data_collector.run(days=365)
-    
+
     # --- FASE 2: Treinamento da Rede Neural ---
     status_log.text("Fase 2/3: Treinando a Rede Neural...")
-    features_tensor = torch.tensor([item[0] for item in data_collector.training_data], dtype=torch.float32)
-    labels_tensor = torch.tensor([item[1] for item in data_collector.training_data], dtype=torch.float32)
-    
-    train_dataset = TensorDataset(features_tensor, labels_tensor)
-    train_loader = DataLoader(dataset=train_dataset, batch_size=64, shuffle=True)
-    
+    features_tensor, labels_tensor = data_collector.training_data.to_tensors()
+
     # Captura o log de treino para exibir na tela
     training_output = io.StringIO()
     with contextlib.redirect_stdout(training_output):
-        train(model, train_loader, epochs=50)
+        train_fast(model, features_tensor, labels_tensor, epochs=50, seed=seed)
     training_log = training_output.getvalue()
+    registry.save(cache_key, model, features_tensor, labels_tensor,
+                  {"seed": seed, "training_log": training_log})
+    return model, training_log
 
-    # --- FASE 3: Simulação Comparativa ---
-    status_log.text("Fase 3/3: Rodando simulações comparativas...")
-    
-    # Simulação COM IA (usando o modelo treinado)
-    sim_ai = Simulator(machines=copy.deepcopy(initial_machines), use_ai=True)
-    sim_ai.run(days=simulation_days)
+def find_prefix(seed, days):
+    """Snapshot mais longo já simulado para esta semente com no máximo `days` dias (ou None)."""
+    entries = st.session_state.get("snapshots", {}).get(seed, [])
+    return max((e for e in entries if e["day"] <= days), key=lambda e: e["day"], default=None)
+
+def remember_prefix(seed, sim_ai, sim_no_ai, training_log):
+    """Guarda o estado das duas simulações para retomar daqui numa próxima execução."""
+    entries = st.session_state.setdefault("snapshots", {}).setdefault(seed, [])
+    entries[:] = [e for e in entries if e["day"] != sim_ai.day]
+    entries.append({"day": sim_ai.day, "ai": sim_ai.snapshot(), "no_ai": sim_no_ai.snapshot(),
+                    "training_log": training_log})
+    entries.sort(key=lambda e: e["day"])
+    del entries[:-MAX_SNAPSHOTS]
+
+def stream_full_simulation(simulation_days, seed, profile=False):
+    """
+    Executa todo o pipeline: coleta, treino e simulação comparativa.
+    A semente torna a execução reproduzível; as duas simulações
+    comparativas usam a mesma semente e enfrentam as mesmas falhas.
+    Gerador: a cada STREAM_CHUNK_DAYS dias devolve (sim_ai, sim_no_ai,
+    training_log) com os resultados parciais das duas simulações.
+    profile: mede as fases da simulação com IA (sim_ai.profiler).
+    Se esta semente já foi simulada por até simulation_days dias, continua
+    do snapshot mais longo em vez de repetir o prefixo (ex.: de 5 para 10 anos).
+    """
+    prefix = find_prefix(seed, simulation_days)
+    if prefix is not None:
+        status_log.text(f"Fase 3/3: Continuando do dia {prefix['day']} já simulado...")
+        training_log = prefix["training_log"]
+        sim_ai = restore(prefix["ai"], profiler=Profiler(profile))
+        sim_no_ai = restore(prefix["no_ai"])
+        yield sim_ai, sim_no_ai, training_log # Mostra o prefixo imediatamente
+    else:
+        # Cria um conjunto único de máquinas para garantir uma comparação justa
+        initial_machines = create_random_machines(rng=random.Random(seed))
+        model, training_log = prepare_model(seed, initial_machines)
+
+        # --- FASE 3: Simulação Comparativa ---
+        status_log.text("Fase 3/3: Rodando simulações comparativas...")
+
+        # Simulação COM IA (usando o modelo treinado) e SEM IA, avançando juntas
+        sim_ai = Simulator(machines=copy.deepcopy(initial_machines), use_ai=True, seed=[seed, 1],
+                           model=model, profiler=Profiler(profile))
+        sim_no_ai = Simulator(machines=copy.deepcopy(initial_machines), use_ai=False, seed=[seed, 1])
+
+    remaining = simulation_days - sim_ai.day
+    for _ in zip(sim_ai.run_iter(remaining, STREAM_CHUNK_DAYS),
+                 sim_no_ai.run_iter(remaining, STREAM_CHUNK_DAYS)):
+        yield sim_ai, sim_no_ai, training_log
 
-    # Simulação SEM IA
-    sim_no_ai = Simulator(machines=copy.deepcopy(initial_machines), use_ai=False)
-    sim_no_ai.run(days=simulation_days)
-    
     status_log.empty()
-    return sim_ai, sim_no_ai, training_log
+
+def live_vpl_frame(sim_ai, sim_no_ai):
+    """VPL parcial das duas simulações, reduzido para o gráfico ao vivo."""
+    vpl_ai = calculate_vpl(sim_ai.logs)
+    vpl_no_ai = calculate_vpl(sim_no_ai.logs)
+    # As duas séries precisam dos mesmos dias: redução por passo fixo (a curva é suave)
+    step = max(1, -(-len(vpl_ai) // PLOT_MAX_POINTS))
+    days = np.arange(1, len(vpl_ai) + 1)[::step]
+    return pd.DataFrame({"Com IA": vpl_ai[::step], "Sem IA": vpl_no_ai[::step]},
+                        index=pd.Index(days, name="Dia"))
 
 # ======================== Execução e Exibição dos Resultados ==========================
 # Placeholder para mensagens de status
 status_log = st.empty()
 
 if run_sim:
-    sim_ai_results, sim_no_ai_results, training_log = run_full_simulation(num_days)
-    
-    st.success("✅ Simulação concluída com sucesso!")
+    # Uma execução interrompida (Cancelar) também vira prefixo reaproveitável
+    previous = st.session_state.get("results")
+    if previous and not previous["done"]:
+        remember_prefix(previous["seed"], *previous["sims"], previous["training_log"])
+    st.session_state.results = None
+    progress = st.progress(0.0)
+    live_col1, live_col2 = st.columns(2)
+    live_metric_ai, live_metric_no_ai = live_col1.empty(), live_col2.empty()
+    live_chart = st.empty()
+
+    # Cada bloco atualiza a tela
+    for sim_ai, sim_no_ai, training_log in stream_full_simulation(num_days, int(seed), profile_sim):
+        st.session_state.results = {"sims": (sim_ai, sim_no_ai), "training_log": training_log,
+                                    "seed": int(seed), "done": False}
+        progress.progress(sim_ai.day / num_days, text=f"Dia {sim_ai.day} de {num_days}")
+        live_metric_ai.metric("Lucro Parcial (Com IA)", f"R$ {sim_ai.stats.total_profit:,.2f}")
+        live_metric_no_ai.metric("Lucro Parcial (Sem IA)", f"R$ {sim_no_ai.stats.total_profit:,.2f}")
+        live_chart.line_chart(live_vpl_frame(sim_ai, sim_no_ai))
+
+    st.session_state.results["done"] = True
+    remember_prefix(int(seed), sim_ai, sim_no_ai, training_log)
+    progress.empty()
+    live_metric_ai.empty()
+    live_metric_no_ai.empty()
+    live_chart.empty()
+
+results = st.session_state.get("results")
+if results:
+    sim_ai_results, sim_no_ai_results = results["sims"]
+    training_log = results["training_log"]
+
+    if results["done"]:
+        st.success("✅ Simulação concluída com sucesso!")
+    else:
+        st.warning(f"⏹️ Simulação cancelada: resultados parciais até o dia {sim_ai_results.day}.")
     
     # Expander para mostrar o log de treino da IA
     with st.expander("Ver Log de Treinamento da Rede Neural"):
         st.code(training_log)
 
+    # Métricas de desempenho por fase (simulação com IA)
+    if sim_ai_results.profiler.enabled:
+        with st.expander("Ver Desempenho por Fase (Com IA)"):
+            profile = sim_ai_results.profiler.summary()
+            st.dataframe(pd.DataFrame(
+                {
+                    "Chamadas": [m["count"] for m in profile.values()],
+                    "Total (s)": [m["total_s"] for m in profile.values()],
+                    "Média (ms)": [m["mean_s"] * 1000 for m in profile.values()],
+                    "p50 (ms)": [m["p50_s"] * 1000 for m in profile.values()],
+                    "p99 (ms)": [m["p99_s"] * 1000 for m in profile.values()],
+                    "Máx (ms)": [m["max_s"] * 1000 for m in profile.values()],
+                },
+                index=pd.Index(list(profile), name="Fase"),
+            ))
+            st.download_button("Baixar métricas (texto)", sim_ai_results.profiler.to_text(),
+                               file_name="with_ai_profile.txt")
+
     # ======================== Relatórios Gerais ==========================
     st.header("📊 Resultados Gerais")
     
-    total_profit_ai = sum(p for _, p, _ in sim_ai_results.logs)
-    total_profit_no_ai = sum(p for _, p, _ in sim_no_ai_results.logs)
+    total_profit_ai = sim_ai_results.stats.total_profit
+    total_profit_no_ai = sim_no_ai_results.stats.total_profit
     
     col1, col2 = st.columns(2)
     with col1:
@@ -126,14 +246,14 @@ if run_sim:
 
     with tab_ai:
         st.subheader("Resumo de Performance (Com IA)")
-        df_ai = save_machines_csv(sim_ai_results.logs, num_machines=len(sim_ai_results.machines))
+        df_ai = save_machines_csv(sim_ai_results.events, num_machines=len(sim_ai_results.machines))
         st.dataframe(df_ai)
         st.subheader("Lucro Acumulado por Máquina (Com IA)")
-        st.pyplot(plot_machine_performance(sim_ai_results.logs, num_machines=len(sim_ai_results.machines)))
+        st.pyplot(plot_machine_performance(sim_ai_results.events, num_machines=len(sim_ai_results.machines)))
         
     with tab_no_ai:
         st.subheader("Resumo de Performance (Sem IA)")
-        df_no_ai = save_machines_csv(sim_no_ai_results.logs, num_machines=len(sim_no_ai_results.machines))
+        df_no_ai = save_machines_csv(sim_no_ai_results.events, num_machines=len(sim_no_ai_results.machines))
         st.dataframe(df_no_ai)
         st.subheader("Lucro Acumulado por Máquina (Sem IA)")
-        st.pyplot(plot_machine_performance(sim_no_ai_results.logs, num_machines=len(sim_no_ai_results.machines)))
\ No newline at end of file
+        st.pyplot(plot_machine_performance(sim_no_ai_results.events, num_machines=len(sim_no_ai_results.machines)))
\ No newline at end of file
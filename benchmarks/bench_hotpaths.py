@@ -0,0 +1,296 @@
+# benchmarks/bench_hotpaths.py
+"""
+Benchmarks dos trechos quentes da simulação, com sementes fixas e
+parametrizados por tamanho de frota e horizonte (dias). Os resultados vão
+para um JSON que pode ser comparado com uma execução anterior:
+
+    python benchmarks/bench_hotpaths.py --json output/bench.json
+    python benchmarks/bench_hotpaths.py --sizes 10 1000 --days 365 --only simulate_day_no_ai
+    python benchmarks/bench_hotpaths.py --json output/novo.json --compare output/bench.json
+
+Com --compare, cada caso mostra a razão novo/antigo e o script sai com
+código 1 se algum ficar mais lento que --threshold.
+"""
+
+import os
+import sys
+import io
+import json
+import time
+import random
+import tempfile
+import argparse
+import contextlib
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from src.sim.machine import create_random_machines
+from src.sim.simulator import Simulator
+
+SEED = 1234
+DEFAULT_SIZES = (10, 100)
+DEFAULT_DAYS = (30, 365)
+AI_MAX_DAYS = 30 # O AG é caro: as simulações com IA usam no máximo este horizonte
+TRAIN_EPOCHS = 5
+
+
+# ==================== Preparação (fora do tempo medido) ====================
+def _machines(size):
+    return create_random_machines(size, rng=random.Random(SEED))
+
+def _predictor():
+    import torch
+    from src.nn.rede_neural import MachinePredictor
+    torch.manual_seed(SEED)
+    return MachinePredictor()
+
+def _collected(size, days):
+    """Simulador sem IA já rodado por `days` dias (logs, eventos e dados de treino)."""
+    sim = Simulator(_machines(size), engine="vector", seed=SEED)
+    sim.run(days)
+    return sim
+
+
+# ==================== Casos ====================
+# Cada caso recebe (size, days) e devolve (função medida, unidades por chamada).
+def bench_simulate_day_no_ai(size, days, engine):
+    def run():
+        sim = Simulator(_machines(size), engine=engine, seed=SEED)
+        for _ in range(days):
+            sim.simulate_day()
+    return run, days
+
+def bench_simulate_day_ai(size, days, engine):
+    predictor = _predictor()
+    def run():
+        sim = Simulator(_machines(size), use_ai=True, engine=engine, seed=SEED, model=predictor)
+        sim.day = 365 # Pula o primeiro ano (sem IA): todos os dias medidos decidem com o AG
+        for _ in range(days):
+            sim.simulate_day()
+    return run, days
+
+def bench_run_to_failure(size, days, engine):
+    def run():
+        if engine == "event":
+            from src.sim.des import EventDrivenSimulator
+            EventDrivenSimulator(_machines(size), seed=SEED).run(days)
+        else:
+            Simulator(_machines(size), engine=engine, seed=SEED).run(days)
+    return run, days
+
+def bench_run_genetic(size, days, eval_mode):
+    from src.genetic.genetic_algorithm import run_genetic
+    machines, predictor = _machines(size), _predictor()
+    def run():
+        run_genetic(machines, [], 365, eval_mode=eval_mode, seed=SEED, model=predictor)
+    return run, 1
+
+def bench_run_islands(size, days):
+    from src.genetic.islands import run_islands
+    machines, predictor = _machines(size), _predictor()
+    def run():
+        run_islands(machines, [], 365, seed=SEED, model=predictor)
+    return run, 1
+
+def bench_evaluate(size, days):
+    from src.genetic.genetic_algorithm import Strategy, evaluate
+    machines = _machines(size)
+    rng = random.Random(SEED)
+    strategies = [Strategy(n_machines=size, rng=rng) for _ in range(100)]
+    rn_predictions = {m.id: False for m in machines}
+    def run():
+        eval_rng = random.Random(SEED)
+        for strategy in strategies:
+            evaluate(strategy, machines, rn_predictions, eval_rng)
+    return run, len(strategies)
+
+def bench_evaluate_population(size, days):
+    from src.genetic.genetic_algorithm import Strategy, evaluate_population
+    machines = _machines(size)
+    rng = random.Random(SEED)
+    strategies = [Strategy(n_machines=size, rng=rng) for _ in range(100)]
+    rn_predictions = {m.id: False for m in machines}
+    def run():
+        evaluate_population(strategies, machines, rn_predictions, np.random.default_rng(SEED))
+    return run, len(strategies)
+
+def bench_predict_maintenance(size, days):
+    import src.nn.rede_neural as rede_neural
+    machines = _machines(size)
+    rede_neural.get_model()
+    def run():
+        for m in machines:
+            rede_neural.predict_maintenance(m)
+    return run, size
+
+def bench_predict_maintenance_batch(size, days):
+    from src.nn.rede_neural import predict_maintenance_batch
+    machines, predictor = _machines(size), _predictor()
+    def run():
+        predict_maintenance_batch(machines, predictor)
+    return run, size
+
+def bench_train(size, days, trainer):
+    import torch
+    from torch.utils.data import DataLoader, TensorDataset
+    from src.nn.rede_neural import MachinePredictor, train, train_fast
+    features, labels = _collected(size, days).training_data.to_tensors()
+    def run():
+        torch.manual_seed(SEED)
+        predictor = MachinePredictor()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if trainer == "train":
+                loader = DataLoader(TensorDataset(features, labels), batch_size=64, shuffle=True)
+                train(predictor, loader, epochs=TRAIN_EPOCHS)
+            else:
+                train_fast(predictor, features, labels, epochs=TRAIN_EPOCHS, patience=0, seed=SEED)
+    return run, len(features) * TRAIN_EPOCHS
+
+def bench_save_machines_csv(size, days):
+    from src.sim.logger import save_machines_csv
+    sim = _collected(size, days)
+    directory = tempfile.mkdtemp()
+    def run():
+        save_machines_csv(sim.events, os.path.join(directory, "machines.csv"), num_machines=size)
+    return run, size
+
+def bench_calculate_vpl(size, days):
+    from src.sim.logger import calculate_vpl
+    logs = _collected(size, days).logs
+    def run():
+        calculate_vpl(logs, 0.08)
+    return run, days
+
+# nome -> (função, variantes, usa size, usa days)
+BENCHMARKS = {
+    "simulate_day_no_ai": (bench_simulate_day_no_ai, {"engine": ("loop", "vector")}, True, True),
+    "simulate_day_ai": (bench_simulate_day_ai, {"engine": ("loop", "vector")}, True, True),
+    "run_to_failure": (bench_run_to_failure, {"engine": ("vector", "event")}, True, True),
+    "run_genetic": (bench_run_genetic, {"eval_mode": ("scalar", "batched")}, True, False),
+    "run_islands": (bench_run_islands, {}, True, False),
+    "evaluate": (bench_evaluate, {}, True, False),
+    "evaluate_population": (bench_evaluate_population, {}, True, False),
+    "predict_maintenance": (bench_predict_maintenance, {}, True, False),
+    "predict_maintenance_batch": (bench_predict_maintenance_batch, {}, True, False),
+    "train": (bench_train, {"trainer": ("train", "train_fast")}, True, True),
+    "save_machines_csv": (bench_save_machines_csv, {}, True, True),
+    "calculate_vpl": (bench_calculate_vpl, {}, False, True),
+}
+
+# Horizonte máximo por caso (horizontes maiores viram este valor)
+MAX_DAYS = {"simulate_day_ai": AI_MAX_DAYS}
+
+
+# ==================== Execução ====================
+def _variants(options):
+    if not options:
+        return [{}]
+    (key, values), = options.items()
+    return [{key: value} for value in values]
+
+def cases(names, sizes, horizons):
+    """Gera (nome, parâmetros) para todas as combinações pedidas."""
+    seen = set()
+    for name in names:
+        _, options, uses_size, uses_days = BENCHMARKS[name]
+        for size in (sizes if uses_size else sizes[:1]):
+            for days in (horizons if uses_days else horizons[:1]):
+                days = min(days, MAX_DAYS.get(name, days))
+                for variant in _variants(options):
+                    params = dict(variant)
+                    if uses_size:
+                        params["size"] = size
+                    if uses_days:
+                        params["days"] = days
+                    if case_id(name, params) in seen:
+                        continue
+                    seen.add(case_id(name, params))
+                    yield name, params, size, days
+
+def case_id(name, params):
+    return name + "".join(f"[{k}={params[k]}]" for k in sorted(params))
+
+def measure(name, params, size, days, repeat):
+    function, options, _, _ = BENCHMARKS[name]
+    variant = {k: params[k] for k in options}
+    run, units = function(size, days, **variant)
+    run() # Aquecimento (imports tardios, caches)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+    return {
+        "name": name,
+        "params": params,
+        "repeat": repeat,
+        "seconds_median": median,
+        "seconds_min": min(times),
+        "units": units,
+        "seconds_per_unit": median / units if units else None,
+    }
+
+def compare(results, baseline_path, threshold):
+    """Razão novo/antigo por caso; retorna os casos acima de threshold."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {case_id(r["name"], r["params"]): r for r in json.load(f)["results"]}
+    regressions = []
+    print(f"\nComparação com {baseline_path}:")
+    for result in results:
+        key = case_id(result["name"], result["params"])
+        if key not in baseline:
+            continue
+        ratio = result["seconds_median"] / baseline[key]["seconds_median"]
+        flag = "  <-- mais lento" if ratio > threshold else ""
+        print(f"  {key:<60} {ratio:6.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append(key)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos trechos quentes da simulação")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="tamanhos de frota")
+    parser.add_argument("--days", type=int, nargs="+", default=list(DEFAULT_DAYS), help="horizontes (dias)")
+    parser.add_argument("--repeat", type=int, default=3, help="execuções medidas por caso (mediana)")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="casos a rodar")
+    parser.add_argument("--json", default=None, help="arquivo de saída com os resultados")
+    parser.add_argument("--compare", default=None, help="JSON de uma execução anterior")
+    parser.add_argument("--threshold", type=float, default=1.2, help="razão considerada regressão")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, params, size, days in cases(args.only or list(BENCHMARKS), args.sizes, args.days):
+        result = measure(name, params, size, days, args.repeat)
+        results.append(result)
+        print(f"{case_id(name, params):<60} {result['seconds_median'] * 1000:10.2f} ms")
+
+    if args.json:
+        import torch
+        directory = os.path.dirname(args.json)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "benchmark": "hotpaths",
+                "seed": SEED,
+                "python": sys.version.split()[0],
+                "numpy": np.__version__,
+                "torch": torch.__version__,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            }, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"REGRESSÃO em {len(regressions)} caso(s)")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
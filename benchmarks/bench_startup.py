@@ -0,0 +1,102 @@
+# benchmarks/bench_startup.py
+"""
+Tempo de inicialização: cada cenário roda num processo Python novo e mede
+o import (e, quando indicado, uma simulação curta). Também confere quais
+bibliotecas pesadas foram carregadas: os cenários sem IA não podem puxar
+torch, matplotlib nem pandas (o script sai com código 1 se puxarem).
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --json output/bench_startup.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("torch", "matplotlib", "pandas")
+
+# nome -> (código, bibliotecas pesadas proibidas)
+SCENARIOS = {
+    "import_simulator": ("import src.sim.simulator", HEAVY_MODULES),
+    "import_sharded": ("import src.sim.sharded", HEAVY_MODULES),
+    "import_replication": ("import src.sim.replication", HEAVY_MODULES),
+    "run_to_failure_30d": (
+        "from src.sim.simulator import Simulator\n"
+        "from src.sim.machine import create_random_machines\n"
+        "import random\n"
+        "Simulator(create_random_machines(rng=random.Random(0)), seed=0).run(30)",
+        HEAVY_MODULES,
+    ),
+    "import_rede_neural": ("import src.nn.rede_neural", ()),
+}
+
+# Roda no processo filho: mede o cenário e informa os módulos carregados
+_PROBE = """
+import sys, json, time
+start = time.perf_counter()
+exec(compile({code!r}, "<cenario>", "exec"))
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed,
+                  "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_scenario(code, repeat):
+    """Mede um cenário `repeat` vezes, cada uma num processo novo."""
+    inner, total, loaded = [], [], []
+    for _ in range(repeat):
+        probe = _PROBE.format(code=code, heavy=HEAVY_MODULES)
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        total.append(time.perf_counter() - start)
+        result = json.loads(out.strip().splitlines()[-1])
+        inner.append(result["seconds"])
+        loaded = result["loaded"]
+    return {
+        "import_seconds_median": statistics.median(inner),
+        "process_seconds_median": statistics.median(total),
+        "import_seconds_min": min(inner),
+        "loaded_heavy_modules": loaded,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do tempo de inicialização")
+    parser.add_argument("--repeat", type=int, default=5, help="processos por cenário (mediana)")
+    parser.add_argument("--only", nargs="*", choices=sorted(SCENARIOS), help="cenários a rodar")
+    parser.add_argument("--json", default=None, help="arquivo de saída com os resultados")
+    args = parser.parse_args(argv)
+
+    results, failures = {}, []
+    for name in args.only or SCENARIOS:
+        code, forbidden = SCENARIOS[name]
+        result = run_scenario(code, args.repeat)
+        results[name] = result
+        bad = [m for m in result["loaded_heavy_modules"] if m in forbidden]
+        if bad:
+            failures.append(f"{name} carregou {', '.join(bad)}")
+        print(f"{name:<22} import {result['import_seconds_median'] * 1000:8.1f} ms   "
+              f"processo {result['process_seconds_median'] * 1000:8.1f} ms   "
+              f"pesados: {', '.join(result['loaded_heavy_modules']) or '-'}")
+
+    if args.json:
+        directory = os.path.dirname(args.json)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"benchmark": "startup", "python": sys.version.split()[0],
+                       "repeat": args.repeat, "results": results}, f, indent=2)
+
+    for failure in failures:
+        print(f"REGRESSÃO: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,7 +18,135 @@ DUR_SIMPLE = 2
 DUR_GRAVE = 7
 DUR_TOTAL = 30
 
+# Probabilidade de cada tipo de falha (simples, grave, total), somando 1
+FAIL_TYPE_WEIGHTS = (0.6, 0.3, 0.1)
+
 # Probabilidades de falha
 BASE_FAIL_RATE = 0.01     # chance mínima de falha por dia (1%)
 AGE_FAIL_FACTOR = 0.0005  # quanto a chance aumenta a cada dia de operação
 MAX_FAIL_RATE = 0.05      # limite máximo de chance de falha (5%)
+
+# Algoritmo Genético
+POPULATION_SIZE = 100
+GENERATIONS = 50
+MUTATION_RATE = 0.2
+NUM_EVAL_SIMULATIONS = 10 # Simulações por avaliação para estabilizar o fitness
+
+# Decisão da RN: recomenda parada se o custo esperado de falha superar o custo da parada * fator
+THRESHOLD_FACTOR = 1.0
+
+# Motor de decisão diária da IA
+DECISION_ENGINE = "genetic"  # "genetic" (Algoritmo Genético), "exact" (ótimo exato por máquina) ou "islands" (AG em ilhas)
+
+# Gráficos
+PLOT_MAX_POINTS = 2000     # Séries maiores são reduzidas antes de desenhar
+PLOT_DOWNSAMPLE = "lttb"   # "lttb", "minmax" ou None (desenha todos os pontos)
+PLOT_DPI = 300             # Resolução dos arquivos salvos (dpi= nas funções de plot para arquivos mais rápidos)
+PLOT_FORMAT = "png"        # Formato dos arquivos salvos ("png", "svg", "pdf", ...)
+
+
+# ==================== Configuração Injetável ====================
+from dataclasses import dataclass, fields, asdict, replace as _replace
+from functools import cached_property
+
+# Campos que mudam os dados de treino da RN (coleta sem IA) e, portanto, o modelo treinado
+MODEL_FIELDS = (
+    "num_machines", "duration_range", "cost_range", "profit_range",
+    "dur_simple", "dur_grave", "dur_total", "fail_type_weights",
+    "base_fail_rate", "age_fail_factor", "max_fail_rate",
+)
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    """
+    Parâmetros de um cenário, imutáveis, passados explicitamente ao
+    Simulator, ao AG (run_genetic/run_exact) e à decisão da RN
+    (predict_maintenance). Os padrões são as constantes acima, então
+    SimulationConfig() reproduz o comportamento de sempre; para variar um
+    cenário (ex.: numa varredura, ver src/sim/sweep.py) use
+    config.replace(base_fail_rate=0.02).
+    """
+    num_machines: int = NUM_MACHINES
+    duration_range: tuple = DURATION_RANGE
+    cost_range: tuple = COST_RANGE
+    profit_range: tuple = PROFIT_RANGE
+
+    cost_repair_simple: float = COST_REPAIR_SIMPLE
+    cost_repair_grave: float = COST_REPAIR_GRAVE
+    cost_repair_total: float = COST_REPAIR_TOTAL
+    dur_simple: int = DUR_SIMPLE
+    dur_grave: int = DUR_GRAVE
+    dur_total: int = DUR_TOTAL
+    fail_type_weights: tuple = FAIL_TYPE_WEIGHTS
+
+    base_fail_rate: float = BASE_FAIL_RATE
+    age_fail_factor: float = AGE_FAIL_FACTOR
+    max_fail_rate: float = MAX_FAIL_RATE
+
+    # Algoritmo Genético
+    population_size: int = POPULATION_SIZE
+    generations: int = GENERATIONS
+    mutation_rate: float = MUTATION_RATE
+    num_eval_simulations: int = NUM_EVAL_SIMULATIONS
+
+    threshold_factor: float = THRESHOLD_FACTOR
+    decision_engine: str = DECISION_ENGINE
+
+    def __post_init__(self):
+        for name in ("duration_range", "cost_range", "profit_range", "fail_type_weights"):
+            object.__setattr__(self, name, tuple(getattr(self, name)))
+
+    def replace(self, **changes):
+        """Cópia com os campos alterados (a configuração original não muda)."""
+        return _replace(self, **changes)
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def field_names(cls):
+        return tuple(f.name for f in fields(cls))
+
+    def model_key(self):
+        """Campos que determinam o modelo treinado (para reaproveitar modelos entre cenários)."""
+        return {name: getattr(self, name) for name in MODEL_FIELDS}
+
+    def fail_chance(self, age):
+        """Chance de falha no dia para a idade `age` (escalar ou array NumPy)."""
+        chance = self.base_fail_rate + age * self.age_fail_factor
+        if hasattr(chance, "clip"):
+            return chance.clip(max=self.max_fail_rate)
+        return min(chance, self.max_fail_rate)
+
+    @property
+    def repair_costs(self):
+        return (self.cost_repair_simple, self.cost_repair_grave, self.cost_repair_total)
+
+    @property
+    def repair_durations(self):
+        return (self.dur_simple, self.dur_grave, self.dur_total)
+
+    @cached_property
+    def repair_costs_array(self):
+        import numpy as np
+        return np.array(self.repair_costs, dtype=np.float64)
+
+    @cached_property
+    def repair_durations_array(self):
+        import numpy as np
+        return np.array(self.repair_durations, dtype=np.int64)
+
+    @cached_property
+    def fail_type_cum_weights(self):
+        """Pesos acumulados dos tipos de falha: tipo = searchsorted(cum, u, side="right")."""
+        import numpy as np
+        return np.cumsum(np.array(self.fail_type_weights, dtype=np.float64))[:-1]
+
+    @property
+    def avg_repair_cost(self):
+        """Custo médio de um reparo, ponderado pelas chances de cada tipo de falha."""
+        return sum(w * c for w, c in zip(self.fail_type_weights, self.repair_costs))
+
+
+DEFAULT_CONFIG = SimulationConfig()
@@ -0,0 +1,69 @@
+# src/genetic/exact.py
+
+import numpy as np
+
+from src.config import DEFAULT_CONFIG
+from src.genetic.genetic_algorithm import Strategy
+from src.sim.profiling import NULL_PROFILER
+
+# "closed_form" (valor esperado exato) ou "monte_carlo" (mesmos sorteios para as duas ações)
+EXACT_METHOD = "closed_form"
+
+
+# ==================== Valor Esperado por Máquina ==========================
+def machine_action_values(machines, rn_predictions, method=EXACT_METHOD, rng=None, config=DEFAULT_CONFIG):
+    """
+    Valor esperado de operar e de parar cada máquina, com as mesmas regras
+    de evaluate (simulate_day_profit_for_eval + penalidade/bônus da RN).
+    Retorna (valor_operar, valor_parar), arrays na ordem de machines.
+    """
+    age = np.array([m.age for m in machines], dtype=np.float64)
+    profit = np.array([m.profit for m in machines], dtype=np.float64)
+    cost = np.array([m.cost for m in machines], dtype=np.float64)
+    rn_pred = np.array([bool(rn_predictions[m.id]) for m in machines])
+
+    fail_chance = config.fail_chance(age)
+    repair_costs = config.repair_costs_array
+
+    if method == "closed_form":
+        expected_repair = float(np.array(config.fail_type_weights) @ repair_costs)
+        operate_value = (1 - fail_chance) * (profit - cost) - fail_chance * expected_repair
+    elif method == "monte_carlo":
+        rng = np.random.default_rng(rng)
+        shape = (config.num_eval_simulations, len(machines))
+        u_fail = rng.random(shape)
+        fail_type = np.searchsorted(config.fail_type_cum_weights, rng.random(shape), side="right")
+        sampled = np.where(u_fail < fail_chance, -repair_costs[fail_type], profit - cost)
+        operate_value = sampled.mean(axis=0)
+    else:
+        raise ValueError(f"Método desconhecido: {method}")
+
+    operate_value = operate_value - np.where(rn_pred, 0.5 * config.cost_repair_grave, 0.0)
+    stop_value = -cost + np.where(rn_pred, 0.5 * profit, 0.0)
+    return operate_value, stop_value
+
+
+# ==================== Otimizador Exato (Alternativa ao AG) ==========================
+def run_exact(machines, day_logs, day, seed=None, model=None, state=None, method=EXACT_METHOD,
+              profiler=None, config=None):
+    """
+    Mesma interface de run_genetic, mas resolve o problema de forma exata.
+    O fitness é uma soma de termos independentes por máquina, então a melhor
+    estratégia escolhe, máquina a máquina, a ação de maior valor esperado:
+    O(máquinas) em vez de uma busca sobre 2^máquinas genomas.
+    state é aceito apenas por compatibilidade e ignorado.
+    """
+    from src.nn.rede_neural import predict_maintenance_batch
+    profiler = NULL_PROFILER if profiler is None else profiler
+    config = DEFAULT_CONFIG if config is None else config
+    with profiler.phase("nn_forward"):
+        decisions = predict_maintenance_batch(machines, model, config).tolist()
+    rn_predictions = {m.id: d for m, d in zip(machines, decisions)}
+
+    with profiler.phase("action_values"):
+        operate_value, stop_value = machine_action_values(machines, rn_predictions, method, seed, config)
+    operate = operate_value >= stop_value
+
+    strategy = Strategy({m.id: op for m, op in zip(machines, operate.tolist())})
+    strategy.fitness = float(np.where(operate, operate_value, stop_value).sum())
+    return strategy
@@ -1,17 +1,18 @@
 # src/genetic/genetic_algorithm.py
 
 import random
-from src.config import (
-    COST_REPAIR_GRAVE,
-    NUM_MACHINES
-)
-from src.nn.rede_neural import predict_maintenance
+import numpy as np
+from src.config import NUM_MACHINES, DEFAULT_CONFIG, POPULATION_SIZE, MUTATION_RATE
+from src.sim.profiling import NULL_PROFILER
 
 # ==================== Parâmetros do AG ====================
-POPULATION_SIZE = 100
-GENERATIONS = 50
-MUTATION_RATE = 0.2
-NUM_EVAL_SIMULATIONS = 10 # NOVO: Número de simulações para estabilizar o fitness
+# POPULATION_SIZE, GENERATIONS, MUTATION_RATE e NUM_EVAL_SIMULATIONS vêm de
+# src.config (padrões de SimulationConfig; passe config= para variar)
+EVAL_MODE = "batched" # "scalar" (evaluate por estratégia) ou "batched" (população inteira em lote)
+
+# Modo persistente (GeneticState): aproveita o AG do dia anterior
+WARM_START_ELITES = 20 # Melhores estratégias de ontem que semeiam a população de hoje
+PATIENCE = 5 # Gerações sem melhora do melhor fitness antes de parar
 
 # ==================== Estratégia ==========================
 class Strategy:
@@ -20,24 +21,25 @@ class Strategy:
     - True = operar
     - False = parada/manutenção preventiva
     """
-    def __init__(self, genes=None):
+    def __init__(self, genes=None, n_machines=NUM_MACHINES, rng=random):
         if genes:
             self.genes = genes
         else:
             # Genes agora são um dicionário {machine_id: T/F} para clareza
-            self.genes = {i: random.choice([True, False]) for i in range(NUM_MACHINES)}
+            self.genes = {i: rng.choice([True, False]) for i in range(n_machines)}
         self.fitness = None
 
-    def mutate(self):
+    def mutate(self, rng=random, rate=MUTATION_RATE):
         for i in self.genes:
-            if random.random() < MUTATION_RATE:
+            if rng.random() < rate:
                 self.genes[i] = not self.genes[i]
 
     @staticmethod
-    def crossover(parent1, parent2):
-        cut = random.randint(1, NUM_MACHINES - 1)
+    def crossover(parent1, parent2, rng=random):
+        n_machines = len(parent1.genes)
+        cut = rng.randint(1, n_machines - 1)
         child_genes = {}
-        for i in range(NUM_MACHINES):
+        for i in range(n_machines):
             if i < cut:
                 child_genes[i] = parent1.genes[i]
             else:
@@ -45,57 +47,52 @@ class Strategy:
         return Strategy(child_genes)
 
 # ==================== Simulação para Avaliação (Função Auxiliar) ==========================
-def simulate_day_profit_for_eval(m, operate):
+def simulate_day_profit_for_eval(m, operate, rng=random, config=DEFAULT_CONFIG):
     """
     Simula o lucro de UMA MÁQUINA para UM DIA.
     Esta função é usada APENAS DENTRO DA AVALIAÇÃO DO AG.
     Retorna o lucro líquido do dia.
     """
-    from src.config import (
-        BASE_FAIL_RATE, AGE_FAIL_FACTOR, MAX_FAIL_RATE,
-        COST_REPAIR_SIMPLE, COST_REPAIR_GRAVE, COST_REPAIR_TOTAL
-    )
-
     if not operate:
         return -m.cost # Custo da parada preventiva
 
     # Chance de falha no dia
-    fail_chance = min(BASE_FAIL_RATE + m.age * AGE_FAIL_FACTOR, MAX_FAIL_RATE)
-    if random.random() < fail_chance:
-        fail_type = random.choices(
+    fail_chance = config.fail_chance(m.age)
+    if rng.random() < fail_chance:
+        fail_type = rng.choices(
             ["simples", "grave", "total"],
-            weights=[0.6, 0.3, 0.1], k=1
+            weights=config.fail_type_weights, k=1
         )[0]
 
         if fail_type == "simples":
-            return -COST_REPAIR_SIMPLE
+            return -config.cost_repair_simple
         elif fail_type == "grave":
-            return -COST_REPAIR_GRAVE
+            return -config.cost_repair_grave
         else: # total
-            return -COST_REPAIR_TOTAL
+            return -config.cost_repair_total
 
     # Se não falhou e operou
     return m.profit - m.cost
 
 # ==================== Avaliação (Fitness Corrigido) ==========================
-def evaluate(strategy, machines, rn_predictions):
+def evaluate(strategy, machines, rn_predictions, rng=random, config=DEFAULT_CONFIG):
     """
     CORRIGIDO: Calcula o fitness da estratégia rodando múltiplas simulações
     para obter um resultado médio e estável, eliminando a sorte.
     """
     total_profit_sum = 0
-    for _ in range(NUM_EVAL_SIMULATIONS): # Roda a simulação várias vezes
+    for _ in range(config.num_eval_simulations): # Roda a simulação várias vezes
         current_sim_profit = 0
         for m in machines:
             gene = strategy.genes[m.id]
             rn_pred = rn_predictions[m.id]
 
             # Simula o resultado financeiro do dia
-            daily_profit = simulate_day_profit_for_eval(m, gene)
+            daily_profit = simulate_day_profit_for_eval(m, gene, rng, config)
 
             # Penalidades e bônus por seguir (ou não) a recomendação da RN
             if gene and rn_pred: # AG opera, mas RN previu falha (ruim)
-                daily_profit -= 0.5 * COST_REPAIR_GRAVE # Penalidade
+                daily_profit -= 0.5 * config.cost_repair_grave # Penalidade
             elif not gene and rn_pred: # AG parou e RN previu falha (bom)
                 daily_profit += 0.5 * m.profit # Bônus
 
@@ -103,42 +100,192 @@ def evaluate(strategy, machines, rn_predictions):
         
         total_profit_sum += current_sim_profit
 
-    strategy.fitness = total_profit_sum / NUM_EVAL_SIMULATIONS # Usa a média
+    strategy.fitness = total_profit_sum / config.num_eval_simulations # Usa a média
     return strategy.fitness
 
+# ==================== Avaliação em Lote (População Inteira) ==========================
+def evaluate_population(population, machines, rn_predictions, rng=None, config=DEFAULT_CONFIG,
+                        common_draws=False):
+    """
+    Avalia todas as estratégias de uma vez. Os genes viram uma matriz
+    booleana (população x máquinas) e cada uma das config.num_eval_simulations
+    réplicas é sorteada em lote, com as mesmas regras de
+    simulate_day_profit_for_eval e as mesmas penalidades/bônus da RN.
+    rng: numpy.random.Generator (ou semente) para resultados reproduzíveis.
+    common_draws: todas as estratégias enfrentam as mesmas falhas (ver population_fitness).
+    """
+    genes = np.array([[s.genes[m.id] for m in machines] for s in population], dtype=bool)
+    fitness = population_fitness(genes, *fleet_arrays(machines, rn_predictions), rng, config,
+                                 common_draws)
+
+    for strat, fit in zip(population, fitness.tolist()):
+        strat.fitness = fit
+    return fitness
+
+def fleet_arrays(machines, rn_predictions):
+    """(idade, lucro, custo, previsão da RN) das máquinas, na ordem de machines."""
+    age = np.array([m.age for m in machines], dtype=np.float64)
+    profit = np.array([m.profit for m in machines], dtype=np.float64)
+    cost = np.array([m.cost for m in machines], dtype=np.float64)
+    rn_pred = np.array([bool(rn_predictions[m.id]) for m in machines])
+    return age, profit, cost, rn_pred
+
+def population_fitness(genes, age, profit, cost, rn_pred, rng=None, config=DEFAULT_CONFIG,
+                       common_draws=False):
+    """
+    Núcleo de evaluate_population sobre arrays: genes (população x máquinas)
+    e os arrays de fleet_arrays. Retorna o fitness de cada linha.
+    common_draws: sorteia as réplicas por máquina, não por estratégia; com o
+    mesmo rng, o fitness de um genoma deixa de depender da linha em que ele
+    está e da geração em que é avaliado.
+    """
+    rng = np.random.default_rng(rng)
+
+    fail_chance = config.fail_chance(age)
+    repair_costs = config.repair_costs_array
+
+    # Parte determinística: parada preventiva e penalidades/bônus da RN
+    base = np.where(genes, 0.0, -cost)
+    base += np.where(genes & rn_pred, -0.5 * config.cost_repair_grave, 0.0)
+    base += np.where(~genes & rn_pred, 0.5 * profit, 0.0)
+    fitness = base.sum(axis=1)
+
+    # Parte estocástica: lucro de quem opera, média das réplicas
+    op_total = np.zeros(len(genes))
+    shape = genes.shape[1:] if common_draws else genes.shape
+    for _ in range(config.num_eval_simulations):
+        u_fail = rng.random(shape)
+        u_type = rng.random(shape)
+        fail_type = np.searchsorted(config.fail_type_cum_weights, u_type, side="right")
+        op_profit = np.where(u_fail < fail_chance, -repair_costs[fail_type], profit - cost)
+        op_total += np.where(genes, op_profit, 0.0).sum(axis=1)
+    fitness += op_total / config.num_eval_simulations
+    return fitness
+
+# ==================== Estado Persistente entre Dias ==========================
+class GeneticState:
+    """
+    Memória do AG de um dia para o outro. O estado da frota quase não muda
+    entre dias, então as melhores estratégias de ontem são um ótimo ponto
+    de partida: a população de hoje começa com elas (o resto é aleatório)
+    e a evolução para quando o melhor fitness não melhora por `patience`
+    gerações.
+    """
+    def __init__(self, elites=WARM_START_ELITES, patience=PATIENCE):
+        self.elites = elites
+        self.patience = patience
+        self.elite_genes = [] # Genes dos melhores do último dia
+        self.generations_used = [] # Gerações efetivamente rodadas em cada dia
+
+    @property
+    def last_generations(self):
+        return self.generations_used[-1] if self.generations_used else None
+
+    def initial_population(self, n_machines, rng, size=POPULATION_SIZE):
+        seeded = [Strategy(dict(genes)) for genes in self.elite_genes
+                  if len(genes) == n_machines]
+        while len(seeded) < size:
+            seeded.append(Strategy(n_machines=n_machines, rng=rng))
+        return seeded[:size]
+
+    def remember(self, population, generations):
+        best = sorted(population, key=lambda s: s.fitness, reverse=True)[:self.elites]
+        self.elite_genes = [dict(s.genes) for s in best]
+        self.generations_used.append(generations)
+
 # ==================== AG Diário (Função Principal) ==========================
-def run_genetic(machines, day_logs, day):
+def run_genetic(machines, day_logs, day, eval_mode=EVAL_MODE, seed=None, model=None, state=None,
+                profiler=None, config=None):
     """
     Executa o Algoritmo Genético para escolher a melhor estratégia do dia.
+    eval_mode: "scalar" (evaluate por estratégia) ou "batched" (evaluate_population).
+    seed: torna o AG reproduzível (operadores genéticos e sorteios da avaliação).
+    model: MachinePredictor usado nas previsões (padrão: o modelo global).
+    state: GeneticState para o modo persistente (partida a quente + parada antecipada);
+    as gerações usadas ficam em state.generations_used. Nesse modo todas as
+    avaliações do dia usam os mesmos sorteios de falha, então a parada por
+    estagnação compara fitness comparáveis, e não ruído de Monte Carlo.
+    profiler: Profiler do simulador (fases nn_forward, evaluate e breed).
+    config: SimulationConfig com os parâmetros do AG e do cenário (padrão: DEFAULT_CONFIG).
     """
-    # Previsões da RN para todas as máquinas (uma vez por dia)
-    rn_predictions = {m.id: predict_maintenance(m) for m in machines}
+    if eval_mode not in ("scalar", "batched"):
+        raise ValueError(f"Modo de avaliação desconhecido: {eval_mode}")
+
+    rng = random if seed is None else random.Random(seed)
+    eval_rng = np.random.default_rng(seed)
+    profiler = NULL_PROFILER if profiler is None else profiler
+    config = DEFAULT_CONFIG if config is None else config
+    population_size = config.population_size
+
+    # Modo persistente: semente fixa das avaliações do dia (números aleatórios comuns)
+    day_eval_seed = None
+    if state is not None:
+        day_eval_seed = seed if seed is not None else random.getrandbits(63)
+
+    def evaluate_all(population):
+        with profiler.phase("evaluate"):
+            if day_eval_seed is not None:
+                if eval_mode == "batched":
+                    evaluate_population(population, machines, rn_predictions,
+                                        np.random.default_rng(day_eval_seed), config, common_draws=True)
+                else:
+                    for strat in population:
+                        evaluate(strat, machines, rn_predictions, random.Random(day_eval_seed), config)
+            elif eval_mode == "batched":
+                evaluate_population(population, machines, rn_predictions, eval_rng, config)
+            else:
+                for strat in population:
+                    evaluate(strat, machines, rn_predictions, rng, config)
+
+    # Previsões da RN para todas as máquinas (um único forward pass por dia)
+    from src.nn.rede_neural import predict_maintenance_batch # Import tardio: torch só com IA
+    with profiler.phase("nn_forward"):
+        decisions = predict_maintenance_batch(machines, model, config).tolist()
+    rn_predictions = {m.id: d for m, d in zip(machines, decisions)}
 
     # População inicial
-    population = [Strategy() for _ in range(POPULATION_SIZE)]
+    if state is not None:
+        population = state.initial_population(len(machines), rng, population_size)
+    else:
+        population = [Strategy(n_machines=len(machines), rng=rng) for _ in range(population_size)]
 
-    for _ in range(GENERATIONS):
+    best_fitness = float("-inf")
+    stale = 0
+    generations = 0
+    for _ in range(config.generations):
+        generations += 1
         # Avalia todas as estratégias
-        for strat in population:
-            evaluate(strat, machines, rn_predictions)
+        evaluate_all(population)
 
         # Seleção (torneio ou roleta seria melhor, mas top 50% é ok)
         population.sort(key=lambda s: s.fitness, reverse=True)
-        top_half = population[:POPULATION_SIZE // 2]
+        top_half = population[:population_size // 2]
+
+        # Parada antecipada (modo persistente)
+        if state is not None:
+            if population[0].fitness > best_fitness:
+                best_fitness = population[0].fitness
+                stale = 0
+            else:
+                stale += 1
+                if stale >= state.patience:
+                    break
 
         # Crossover e mutação
-        new_population = top_half[:]
-        while len(new_population) < POPULATION_SIZE:
-            p1, p2 = random.sample(top_half, 2)
-            child = Strategy.crossover(p1, p2)
-            child.mutate()
-            new_population.append(child)
+        with profiler.phase("breed"):
+            new_population = top_half[:]
+            while len(new_population) < population_size:
+                p1, p2 = rng.sample(top_half, 2)
+                child = Strategy.crossover(p1, p2, rng)
+                child.mutate(rng, config.mutation_rate)
+                new_population.append(child)
         population = new_population
 
     # Reavalia a população final para garantir o melhor
-    for strat in population:
-        evaluate(strat, machines, rn_predictions)
-        
+    evaluate_all(population)
     best_strategy = max(population, key=lambda s: s.fitness)
 
+    if state is not None:
+        state.remember(population, generations)
+
     return best_strategy
\ No newline at end of file
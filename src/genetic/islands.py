@@ -0,0 +1,183 @@
+# src/genetic/islands.py
+
+import os
+import atexit
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.config import DEFAULT_CONFIG
+from src.genetic.genetic_algorithm import Strategy, fleet_arrays, population_fitness
+from src.sim.profiling import NULL_PROFILER
+
+# ==================== Parâmetros do Modelo de Ilhas ====================
+N_ISLANDS = None # Ilhas (uma população de config.population_size cada); None = núcleos da CPU
+MIGRATION_INTERVAL = 10 # Gerações entre migrações
+MIGRANTS = 5 # Melhores de cada ilha que substituem os piores da ilha vizinha (anel)
+
+_pool = None
+_pool_workers = 0
+
+
+def get_pool(n_workers):
+    """Pool de processos compartilhado entre os dias (criado na primeira chamada)."""
+    global _pool, _pool_workers
+    if _pool is None or _pool_workers < n_workers:
+        shutdown_pool()
+        # spawn: os workers só importam NumPy e o AG, nunca o torch do processo principal
+        _pool = ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context("spawn"))
+        _pool_workers = n_workers
+    return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+    _pool, _pool_workers = None, 0
+
+
+atexit.register(shutdown_pool)
+
+
+# ==================== Evolução de Uma Ilha (Worker) ====================
+def evolve_island(genes, arrays, generations, seed, config=DEFAULT_CONFIG, eval_seed=None):
+    """
+    Roda `generations` gerações do AG sobre a matriz de genes
+    (população x máquinas), com os mesmos operadores de run_genetic:
+    seleção da metade superior, crossover de um ponto e mutação por gene.
+    arrays: (idade, lucro, custo, previsão da RN), ver fleet_arrays.
+    eval_seed: se dado, toda avaliação usa os mesmos sorteios de falha
+    (common_draws), e o fitness é comparável entre gerações e ilhas.
+    Retorna (genes, fitness) da população final, reavaliada.
+    """
+    rng = np.random.default_rng(seed)
+    genes = np.array(genes, dtype=bool)
+    size, n_machines = genes.shape
+    half = size // 2
+    columns = np.arange(n_machines)
+
+    def evaluate(genes):
+        if eval_seed is None:
+            return population_fitness(genes, *arrays, rng, config)
+        return population_fitness(genes, *arrays, np.random.default_rng(eval_seed), config,
+                                  common_draws=True)
+
+    for _ in range(generations):
+        fitness = evaluate(genes)
+        top = genes[np.argsort(-fitness, kind="stable")[:half]]
+
+        n_children = size - half
+        p1 = rng.integers(half, size=n_children)
+        p2 = (p1 + rng.integers(1, max(half, 2), size=n_children)) % half # Pais distintos
+        cut = rng.integers(1, max(n_machines, 2), size=n_children)
+        children = np.where(columns < cut[:, None], top[p1], top[p2])
+        children ^= rng.random(children.shape) < config.mutation_rate
+        genes = np.concatenate([top, children])
+
+    return genes, evaluate(genes)
+
+
+def _migrate(islands, fitnesses, migrants):
+    """Anel: os `migrants` melhores da ilha i substituem os piores da ilha i + 1."""
+    n = len(islands)
+    if n < 2 or migrants <= 0:
+        return
+    order = [np.argsort(-f, kind="stable") for f in fitnesses]
+    elites = [(islands[i][order[i][:migrants]].copy(), fitnesses[i][order[i][:migrants]].copy())
+              for i in range(n)]
+    for i in range(n):
+        target = (i + 1) % n
+        worst = order[target][-migrants:]
+        islands[target][worst], fitnesses[target][worst] = elites[i]
+
+
+# ==================== AG em Ilhas (Mesma Interface de run_genetic) ====================
+def run_islands(machines, day_logs, day, seed=None, model=None, state=None, profiler=None,
+                config=None, n_islands=N_ISLANDS, migration_interval=MIGRATION_INTERVAL,
+                migrants=MIGRANTS, parallel=True):
+    """
+    Algoritmo Genético em ilhas: n_islands populações evoluem em paralelo
+    (um processo por ilha) e, a cada migration_interval gerações, trocam
+    as melhores estratégias em anel. A largura da busca cresce com os
+    núcleos e o tempo por dia fica próximo ao de uma população só.
+    Retorna a melhor estratégia entre todas as ilhas.
+
+    A RN roda uma vez, no processo principal; as ilhas recebem só arrays
+    (idade, lucro, custo, previsão). Com a mesma seed o resultado é o
+    mesmo com ou sem processos (parallel=False roda as ilhas em sequência).
+    state: GeneticState; as ilhas partem das elites de ontem e a evolução
+    para quando uma rodada entre migrações não melhora o melhor fitness.
+    Nesse modo todas as ilhas avaliam contra os mesmos sorteios do dia,
+    então a parada compara fitness comparáveis, e não ruído de Monte Carlo.
+    """
+    from src.nn.rede_neural import predict_maintenance_batch # Import tardio: torch só com IA
+    profiler = NULL_PROFILER if profiler is None else profiler
+    config = DEFAULT_CONFIG if config is None else config
+    n_islands = max(1, n_islands or os.cpu_count() or 1)
+    size, n_machines = config.population_size, len(machines)
+
+    with profiler.phase("nn_forward"):
+        decisions = predict_maintenance_batch(machines, model, config).tolist()
+    rn_predictions = {m.id: d for m, d in zip(machines, decisions)}
+    arrays = fleet_arrays(machines, rn_predictions)
+
+    # Populações iniciais (com partida a quente no modo persistente)
+    root = np.random.SeedSequence(seed)
+    init_rng = np.random.default_rng(root.spawn(1)[0])
+    islands = []
+    for _ in range(n_islands):
+        genes = init_rng.random((size, n_machines)) < 0.5
+        if state is not None:
+            elites = [[g[m.id] for m in machines] for g in state.elite_genes if len(g) == n_machines]
+            if elites:
+                genes[:min(len(elites), size)] = np.array(elites[:size], dtype=bool)
+        islands.append(genes)
+    fitnesses = [None] * n_islands
+    # Modo persistente: semente fixa das avaliações do dia (números aleatórios comuns)
+    eval_seed = None
+    if state is not None:
+        eval_seed = int(np.random.SeedSequence(root.entropy, spawn_key=(2,)).generate_state(1)[0])
+
+    pool = get_pool(n_islands) if parallel and n_islands > 1 else None
+    best_fitness = float("-inf")
+    generations = 0
+    for epoch in range(-(-config.generations // migration_interval)):
+        epoch_generations = min(migration_interval, config.generations - generations)
+        seeds = [np.random.SeedSequence(root.entropy, spawn_key=(1, i, epoch)) for i in range(n_islands)]
+        with profiler.phase("islands"):
+            if pool is not None:
+                futures = [pool.submit(evolve_island, islands[i], arrays, epoch_generations, seeds[i],
+                                       config, eval_seed)
+                           for i in range(n_islands)]
+                results = [f.result() for f in futures]
+            else:
+                results = [evolve_island(islands[i], arrays, epoch_generations, seeds[i], config, eval_seed)
+                           for i in range(n_islands)]
+        islands = [genes for genes, _ in results]
+        fitnesses = [fitness for _, fitness in results]
+        generations += epoch_generations
+
+        epoch_best = max(float(f.max()) for f in fitnesses)
+        if state is not None and epoch_best <= best_fitness:
+            break
+        best_fitness = max(best_fitness, epoch_best)
+        if generations < config.generations:
+            with profiler.phase("migrate"):
+                _migrate(islands, fitnesses, migrants)
+
+    # Melhor estratégia entre todas as ilhas
+    all_genes = np.concatenate(islands)
+    all_fitness = np.concatenate(fitnesses)
+    ids = [m.id for m in machines]
+
+    def to_strategy(row):
+        strategy = Strategy({mid: op for mid, op in zip(ids, all_genes[row].tolist())})
+        strategy.fitness = float(all_fitness[row])
+        return strategy
+
+    order = np.argsort(-all_fitness, kind="stable")
+    if state is not None:
+        state.remember([to_strategy(row) for row in order[:state.elites]], generations)
+    return to_strategy(order[0])
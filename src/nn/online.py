@@ -0,0 +1,105 @@
+# src/nn/online.py
+
+import copy
+import threading
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+from src.nn.rede_neural import FEATURE_NAMES
+
+# ===================== PARÂMETROS DO APRENDIZADO ONLINE =====================
+REPLAY_BUFFER_SIZE = 20000 # Máximo de pares (features, falhou) guardados
+UPDATE_EVERY_DAYS = 30     # A cada K dias roda uma atualização
+UPDATE_STEPS = 20          # Passos de gradiente por atualização
+UPDATE_BATCH_SIZE = 64
+
+
+class OnlineLearner:
+    """
+    Aprendizado incremental durante a simulação com IA.
+
+    Cada dia, os pares (features, falhou_hoje) entram num buffer circular
+    limitado. A cada `update_every` dias, alguns passos de gradiente são
+    dados numa CÓPIA dos pesos, com mini-lotes sorteados do buffer; ao
+    terminar, a cópia passa a ser o modelo servido (troca de referência).
+    Com background=True o treino roda numa thread e a predição nunca espera
+    por ele; com background=False a atualização é síncrona e a execução
+    fica reproduzível.
+    """
+    def __init__(self, model, buffer_size=REPLAY_BUFFER_SIZE, update_every=UPDATE_EVERY_DAYS,
+                 steps=UPDATE_STEPS, batch_size=UPDATE_BATCH_SIZE, lr=0.001,
+                 background=True, seed=None):
+        self.model = model # Modelo servido (sempre pronto para predição)
+        self.update_every = update_every
+        self.steps = steps
+        self.batch_size = batch_size
+        self.lr = lr
+        self.background = background
+        self.updates = 0 # Atualizações concluídas
+
+        n_features = len(FEATURE_NAMES)
+        self._features = np.zeros((buffer_size, n_features), dtype=np.float32)
+        self._labels = np.zeros((buffer_size, 1), dtype=np.float32)
+        self._size = 0
+        self._pos = 0
+        self._rng = np.random.default_rng(seed)
+        self._thread = None
+
+    def __len__(self):
+        return self._size
+
+    def observe(self, features, labels):
+        """Adiciona as observações de um dia ao buffer circular."""
+        features = np.asarray(features, dtype=np.float32).reshape(-1, self._features.shape[1])
+        labels = np.asarray(labels, dtype=np.float32).reshape(-1, 1)
+        capacity = len(self._features)
+        if len(features) >= capacity: # Dia maior que o buffer: fica só com o final
+            features, labels = features[-capacity:], labels[-capacity:]
+        idx = (self._pos + np.arange(len(features))) % capacity
+        self._features[idx] = features
+        self._labels[idx] = labels
+        self._pos = int((self._pos + len(features)) % capacity)
+        self._size = min(capacity, self._size + len(features))
+
+    @property
+    def training(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def maybe_update(self, day):
+        """Dispara uma atualização a cada `update_every` dias (se nenhuma estiver em andamento)."""
+        if day % self.update_every != 0 or self._size < self.batch_size or self.training:
+            return False
+        # Amostras sorteadas agora: o treino não lê o buffer enquanto ele muda
+        idx = self._rng.integers(0, self._size, size=(self.steps, self.batch_size))
+        X = torch.from_numpy(self._features[idx])
+        y = torch.from_numpy(self._labels[idx])
+        candidate = copy.deepcopy(self.model)
+
+        if self.background:
+            self._thread = threading.Thread(target=self._train_copy, args=(candidate, X, y), daemon=True)
+            self._thread.start()
+        else:
+            self._train_copy(candidate, X, y)
+        return True
+
+    def _train_copy(self, candidate, X, y):
+        criterion = nn.BCELoss()
+        optimizer = optim.Adam(candidate.parameters(), lr=self.lr)
+        candidate.train()
+        for step in range(len(X)):
+            optimizer.zero_grad(set_to_none=True)
+            loss = criterion(candidate(X[step]), y[step])
+            loss.backward()
+            optimizer.step()
+        candidate.eval()
+        self.model = candidate # Troca atômica do modelo servido
+        self.updates += 1
+
+    def wait(self):
+        """Espera a atualização em andamento (se houver) terminar."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -3,7 +3,17 @@
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from src.config import COST_REPAIR_SIMPLE, COST_REPAIR_GRAVE, COST_REPAIR_TOTAL, NUM_MACHINES
+from src.config import NUM_MACHINES, DEFAULT_CONFIG
+
+# Ordem das features de entrada (ver machine_features); faz parte da chave do cache de modelos
+FEATURE_NAMES = (
+    "age",
+    "last_fail_days",
+    "profit",
+    "cost",
+    "fail_count_simple",
+    "fail_count_grave_total",
+)
 
 # ===================== DEFINIÇÃO DA REDE NEURAL =====================
 class MachinePredictor(nn.Module):
@@ -21,8 +31,21 @@ class MachinePredictor(nn.Module):
         x = self.sigmoid(self.fc3(x))
         return x
 
-# Modelo global que será treinado
-model = MachinePredictor()
+# Modelo global que será treinado: criado no primeiro acesso a `model`
+_model = None
+
+def get_model():
+    """Modelo global (MachinePredictor), criado sob demanda."""
+    global _model
+    if _model is None:
+        _model = MachinePredictor()
+    return _model
+
+def __getattr__(name):
+    # `from src.nn.rede_neural import model` continua funcionando
+    if name == "model":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ===================== FUNÇÃO DE TREINO =====================
 def train(model, data_loader, epochs=50, lr=0.001):
@@ -46,33 +69,127 @@ def train(model, data_loader, epochs=50, lr=0.001):
             print(f"Época {epoch+1}/{epochs}, Perda Média: {total_loss / len(data_loader):.4f}")
     print("Treinamento concluído.")
 
-# ===================== FUNÇÃO DE PREDIÇÃO =====================
-THRESHOLD_FACTOR = 1.0 # Ajustado: Recomenda parada se o custo esperado de falha superar o custo da parada.
-
-def predict_maintenance(machine):
+# ===================== TREINO RÁPIDO (TENSORES EM MEMÓRIA) =====================
+def train_fast(model, features, labels, epochs=50, lr=0.001, batch_size=64,
+               val_fraction=0.2, patience=5, num_threads=None, seed=None):
     """
-    Usa a RN treinada para prever se a manutenção é necessária.
-    Retorna True se a parada for recomendada, False caso contrário.
+    Mesmo treino de `train`, sem DataLoader: embaralha e fatia os tensores
+    diretamente, acumula a perda no próprio tensor (um único sync por
+    época) e para cedo quando a perda de validação não melhora por
+    `patience` épocas, restaurando os melhores pesos.
+
+    features/labels: tensores, arrays ou listas (n x 6) e (n x 1).
+    val_fraction: fração separada para validação (0 desliga a parada antecipada).
+    num_threads: threads do torch durante o treino (None = padrão atual).
+    seed: semente do embaralhamento (None = sorteada do gerador padrão do torch).
+    Retorna o histórico {"train_loss": [...], "val_loss": [...], "epochs": n}.
     """
-    model.eval() # Coloca o modelo em modo de avaliação (importante)
-    
-    # Monta o tensor de features para a máquina
-    features = torch.tensor([[
+    features = torch.as_tensor(features, dtype=torch.float32)
+    labels = torch.as_tensor(labels, dtype=torch.float32).reshape(len(features), -1)
+    if seed is None:
+        # Sem semente explícita, segue o gerador padrão (respeita torch.manual_seed)
+        seed = int(torch.randint(2**62, ()))
+    generator = torch.Generator()
+    generator.manual_seed(seed)
+
+    previous_threads = torch.get_num_threads()
+    if num_threads:
+        torch.set_num_threads(num_threads)
+
+    # Separação treino/validação
+    perm = torch.randperm(len(features), generator=generator)
+    n_val = int(len(features) * val_fraction) if patience else 0
+    X_val, y_val = features[perm[:n_val]], labels[perm[:n_val]]
+    X_train, y_train = features[perm[n_val:]], labels[perm[n_val:]]
+    n_batches = max(1, -(-len(X_train) // batch_size))
+
+    criterion = nn.BCELoss()
+    optimizer = optim.Adam(model.parameters(), lr=lr)
+    history = {"train_loss": [], "val_loss": [], "epochs": 0}
+    best_val, best_state, stale = float("inf"), None, 0
+
+    print(f"Iniciando treinamento rápido por até {epochs} épocas...")
+    try:
+        for epoch in range(epochs):
+            model.train()
+            order = torch.randperm(len(X_train), generator=generator)
+            X, y = X_train[order], y_train[order]
+            total_loss = torch.zeros(())
+            for start in range(0, len(X), batch_size):
+                optimizer.zero_grad(set_to_none=True)
+                loss = criterion(model(X[start:start + batch_size]), y[start:start + batch_size])
+                loss.backward()
+                optimizer.step()
+                total_loss += loss.detach()
+
+            history["train_loss"].append(total_loss.item() / n_batches)
+            history["epochs"] = epoch + 1
+
+            if n_val:
+                model.eval()
+                with torch.no_grad():
+                    val_loss = criterion(model(X_val), y_val).item()
+                history["val_loss"].append(val_loss)
+                if val_loss < best_val:
+                    best_val, stale = val_loss, 0
+                    best_state = {k: v.clone() for k, v in model.state_dict().items()}
+                else:
+                    stale += 1
+
+            if (epoch + 1) % 10 == 0:
+                print(f"Época {epoch+1}/{epochs}, Perda Média: {history['train_loss'][-1]:.4f}")
+            if n_val and stale >= patience:
+                print(f"Parada antecipada na época {epoch+1} (validação sem melhora por {patience} épocas).")
+                break
+    finally:
+        torch.set_num_threads(previous_threads)
+
+    if best_state is not None:
+        model.load_state_dict(best_state)
+    print("Treinamento concluído.")
+    return history
+
+# ===================== FUNÇÃO DE PREDIÇÃO =====================
+def machine_features(machine):
+    """Linha de features de uma máquina, na ordem usada no treino."""
+    return [
         machine.age,
         machine.last_fail_days,
         machine.profit,
         machine.cost,
         machine.fail_count_simple,
         machine.fail_count_grave + machine.fail_count_total # Falhas graves e totais juntas
-    ]], dtype=torch.float32)
+    ]
+
+def predict_maintenance_batch(rows, predictor=None, config=None):
+    """
+    Decide a manutenção de várias máquinas com um único forward pass.
+    rows: lista de Machine ou matriz (n x 6) de features (lista, ndarray ou tensor).
+    predictor: rede a usar (padrão: o modelo global).
+    config: SimulationConfig com os custos de reparo e o threshold_factor (padrão: DEFAULT_CONFIG).
+    Retorna um tensor booleano com n decisões (True = parada recomendada).
+    """
+    predictor = get_model() if predictor is None else predictor
+    if len(rows) == 0:
+        return torch.zeros(0, dtype=torch.bool)
+    if hasattr(rows[0], "age"):
+        rows = [machine_features(m) for m in rows]
+    features = torch.as_tensor(rows, dtype=torch.float32)
 
+    predictor.eval() # Coloca o modelo em modo de avaliação (importante)
     with torch.no_grad(): # Não calcula gradientes durante a predição
-        fail_prob = model(features)[0].item()
+        fail_prob = predictor(features)[:, 0]
 
-    # Custo esperado de uma falha (simplificado)
-    # Média ponderada dos custos de reparo
-    avg_repair_cost = (0.6 * COST_REPAIR_SIMPLE + 0.3 * COST_REPAIR_GRAVE + 0.1 * COST_REPAIR_TOTAL)
-    expected_fail_cost = fail_prob * avg_repair_cost
+    config = DEFAULT_CONFIG if config is None else config
+    expected_fail_cost = fail_prob * config.avg_repair_cost
 
     # Decisão: Parar se o custo esperado da falha for maior que o custo da manutenção
-    return expected_fail_cost > machine.cost * THRESHOLD_FACTOR
\ No newline at end of file
+    return expected_fail_cost > features[:, 3] * config.threshold_factor
+
+def predict_maintenance(machine, config=None):
+    """
+    Usa a RN treinada para prever se a manutenção é necessária.
+    Retorna True se a parada for recomendada, False caso contrário.
+    Para a frota inteira, prefira predict_maintenance_batch.
+    """
+    return bool(predict_maintenance_batch([machine], config=config)[0])
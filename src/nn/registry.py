@@ -0,0 +1,116 @@
+# src/nn/registry.py
+
+import os
+import json
+import time
+import hashlib
+
+import torch
+
+from src.config import DEFAULT_CONFIG
+from src.nn.rede_neural import MachinePredictor, FEATURE_NAMES
+
+MODEL_CACHE_DIR = "output/model_cache"
+MAX_CACHE_BYTES = 200 * 1024 * 1024 # Limite do cache em disco (mais antigos saem primeiro)
+
+
+def scenario_config(config=DEFAULT_CONFIG):
+    """
+    Parâmetros do cenário que afetam o modelo treinado (config.model_key():
+    frota, durações e taxas de falha). Gráficos, horizonte, custos e AG
+    ficam de fora e não invalidam o cache.
+    """
+    return config.model_key()
+
+
+class ModelRegistry:
+    """
+    Cache persistente de modelos MachinePredictor treinados.
+
+    Cada entrada guarda os pesos, o dataset de treino (features e rótulos)
+    e metadados, sob uma chave que é o hash do cenário (config), da semente
+    e do esquema de features. Vale entre execuções e reinícios do processo;
+    quando o diretório passa de max_bytes, as entradas usadas há mais
+    tempo são removidas.
+    """
+    def __init__(self, root=MODEL_CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def key(self, seed, config=None, **extra):
+        """
+        Chave do cenário: hash de config + semente + esquema de features (+ extras).
+        config: dict ou SimulationConfig (só os campos que afetam o modelo, ver model_key).
+        """
+        if config is None or hasattr(config, "model_key"):
+            config = scenario_config(DEFAULT_CONFIG if config is None else config)
+        payload = {
+            "config": config,
+            "seed": seed,
+            "features": list(FEATURE_NAMES),
+            "extra": extra,
+        }
+        blob = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:24]
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.pt")
+
+    def save(self, key, model, features, labels, metadata=None):
+        """Grava a entrada (escrita atômica) e aplica o limite de tamanho."""
+        os.makedirs(self.root, exist_ok=True)
+        entry = {
+            "state_dict": model.state_dict(),
+            "features": torch.as_tensor(features, dtype=torch.float32),
+            "labels": torch.as_tensor(labels, dtype=torch.float32),
+            "metadata": dict(metadata or {}, saved_at=time.time(), features_schema=list(FEATURE_NAMES)),
+        }
+        path = self._path(key)
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        torch.save(entry, tmp_path)
+        os.replace(tmp_path, path)
+        self.evict(keep=key)
+        return path
+
+    def load(self, key, model=None):
+        """
+        Carrega a entrada, se existir: (modelo, features, rótulos, metadados).
+        Os pesos vão para `model` (ou para um MachinePredictor novo).
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            entry = torch.load(path, weights_only=True)
+            # Pesos num MachinePredictor temporário: `model` só muda se a entrada for válida
+            loaded = MachinePredictor()
+            loaded.load_state_dict(entry["state_dict"])
+            features, labels, metadata = entry["features"], entry["labels"], entry["metadata"]
+        except Exception:
+            os.remove(path) # Entrada corrompida ou incompatível: descarta
+            return None
+        os.utime(path) # Marca como usada recentemente
+        if model is None:
+            model = loaded
+        else:
+            model.load_state_dict(loaded.state_dict())
+        return model, features, labels, metadata
+
+    def evict(self, keep=None):
+        """Remove as entradas menos usadas até o cache caber em max_bytes."""
+        if not os.path.isdir(self.root):
+            return
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".pt"):
+                path = os.path.join(self.root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == self._path(keep):
+                continue
+            os.remove(path)
+            total -= size
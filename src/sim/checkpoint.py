@@ -0,0 +1,125 @@
+# src/sim/checkpoint.py
+
+import os
+import copy
+import pickle
+
+import numpy as np
+
+from .training_buffer import TrainingBuffer
+
+SNAPSHOT_VERSION = 1
+
+# Estado do Simulator copiado no snapshot (além das máquinas, do dia e dos pesos)
+_STATE_FIELDS = ("logs", "events", "stats", "ga_state", "fleet")
+
+
+def snapshot(sim):
+    """
+    Estado completo de um Simulator num dict independente dele: máquinas,
+    dia, semente dos fluxos aleatórios, pesos da RN, resultados agregados
+    (stats), histórico (logs/events), AG persistente e dados de treino.
+    Como os sorteios do RandomStreams são indexados pelo dia, a semente
+    basta para continuar exatamente de onde parou.
+
+    Não entram recursos presos ao processo: online_learner, log_sink e
+    profiler são passados de novo ao restaurar.
+    """
+    sim.sync_machines()
+    state = {
+        "version": SNAPSHOT_VERSION,
+        "day": sim.day,
+        "machines": sim.machines,
+        "use_ai": sim.use_ai,
+        "engine": sim.engine,
+        "decision_engine": sim.decision_engine,
+        "config": sim.config,
+        "history_days": sim.logs.maxlen if hasattr(sim.logs, "maxlen") else None,
+        "seed_sequence": sim.streams.seed_sequence,
+        "model_state": _model_state(sim),
+        "training_data": (np.array(sim.training_data.features), np.array(sim.training_data.labels)),
+    }
+    for field in _STATE_FIELDS:
+        state[field] = getattr(sim, field, None)
+    return copy.deepcopy(state)
+
+
+def _model_state(sim):
+    """Pesos usados pela IA (modelo do learner, o passado ao Simulator ou o global)."""
+    if not sim.use_ai:
+        return None
+    if sim.online_learner is not None:
+        model = sim.online_learner.model
+    elif sim.model is not None:
+        model = sim.model
+    else:
+        from src.nn.rede_neural import get_model
+        model = get_model()
+    return {k: v.detach().cpu().clone() for k, v in model.state_dict().items()}
+
+
+def restore(state, copy_state=True, **overrides):
+    """
+    Novo Simulator a partir de um snapshot. `overrides` vai para o
+    construtor (ex.: use_ai, decision_engine, config, log_sink, profiler,
+    online_learner, model) e permite bifurcar cenários "e se" a partir do
+    mesmo prefixo simulado.
+    copy_state=False reaproveita os objetos do snapshot (só quando ele não
+    será usado de novo, como em Simulator.fork).
+    """
+    from .simulator import Simulator # Import tardio: simulator importa este módulo
+
+    if state.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Versão de snapshot não suportada: {state.get('version')}")
+    if copy_state:
+        state = copy.deepcopy(state)
+
+    options = {
+        "use_ai": state["use_ai"],
+        "engine": state["engine"],
+        "decision_engine": state["decision_engine"],
+        "history_days": state["history_days"],
+        "seed": state["seed_sequence"],
+        "config": state.get("config"),
+    }
+    options.update(overrides)
+    if "model" not in overrides and state["model_state"] is not None:
+        from src.nn.rede_neural import MachinePredictor
+        model = MachinePredictor()
+        model.load_state_dict(state["model_state"])
+        options["model"] = model
+
+    sim = Simulator(state["machines"], **options)
+    sim.day = state["day"]
+    for field in _STATE_FIELDS:
+        if field == "ga_state" and "persistent_ga" in overrides:
+            continue
+        if field == "fleet" and sim.engine != state["engine"]:
+            continue # Troca de motor: o novo motor parte de sim.machines
+        if state[field] is not None:
+            setattr(sim, field, state[field])
+    if "training_buffer" not in overrides:
+        features, labels = state["training_data"]
+        buffer = TrainingBuffer(capacity=max(1, len(features)))
+        buffer.extend(features, labels)
+        sim.training_data = buffer
+    return sim
+
+
+def save_checkpoint(sim, path):
+    """Grava o snapshot de `sim` em disco (escrita atômica)."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot(sim), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_checkpoint(path, **overrides):
+    """Restaura um Simulator gravado por save_checkpoint."""
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    return restore(state, copy_state=False, **overrides)
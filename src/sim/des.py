@@ -0,0 +1,213 @@
+# src/sim/des.py
+
+import heapq
+
+import numpy as np
+
+from .fleet import (
+    FleetState, EVENT_NAMES, EVENT_OPERANDO, EVENT_INDISPONIVEL,
+    EVENT_FALHA_SIMPLES
+)
+from .rng import RandomStreams
+from .stats import StreamingStats
+from .profiling import NULL_PROFILER
+from ..config import SIM_DAYS, DEFAULT_CONFIG
+
+N_EVENTS = len(EVENT_NAMES)
+NEVER = np.iinfo(np.int64).max // 4 # Dia de falha de quem nunca falha (taxa zero)
+
+
+class HazardTable:
+    """
+    Risco acumulado por idade: L(a) = soma de -log(1 - p(j)) para j <= a,
+    com p(j) = config.fail_chance(j). Como p(j) para de crescer no teto
+    (MAX_FAIL_RATE), a tabela vai só até a primeira idade no teto e depois
+    L cresce linearmente.
+
+    Falhar no dia em que a máquina tem idade a' (partindo da idade a) tem
+    a mesma distribuição que sortear um dia por vez: com E ~ Exp(1), a
+    falha acontece na primeira idade a' >= a com L(a') - L(a - 1) >= E
+    (transformada inversa da sobrevivência).
+    """
+    def __init__(self, config=DEFAULT_CONFIG):
+        if config.age_fail_factor > 0 and config.base_fail_rate < config.max_fail_rate:
+            last_age = int(np.ceil((config.max_fail_rate - config.base_fail_rate) / config.age_fail_factor))
+        else:
+            last_age = 0
+        chance = config.fail_chance(np.arange(last_age + 1, dtype=np.float64))
+        with np.errstate(divide="ignore"):
+            hazard = -np.log1p(-np.minimum(chance, 1.0))
+        self.cumulative = np.cumsum(hazard)
+        self.last_age = last_age
+        self.tail = float(hazard[-1]) # Risco diário depois do teto
+
+    def cumulative_before(self, age):
+        """L(age - 1) (0 para idade 0), vetorizado."""
+        k = np.asarray(age, dtype=np.int64) - 1
+        inside = self.cumulative[np.clip(k, 0, self.last_age)]
+        beyond = self.cumulative[-1] + (k - self.last_age) * self.tail
+        return np.where(k < 0, 0.0, np.where(k <= self.last_age, inside, beyond))
+
+    def failure_age(self, age, exp_draws):
+        """Idade em que cada máquina falha, partindo de `age`, com sorteios Exp(1)."""
+        age = np.asarray(age, dtype=np.int64)
+        target = self.cumulative_before(age) + exp_draws
+        result = np.searchsorted(self.cumulative, target, side="left").astype(np.int64)
+        beyond = result > self.last_age
+        if beyond.any():
+            if self.tail > 0:
+                extra = np.ceil((target[beyond] - self.cumulative[-1]) / self.tail)
+                result[beyond] = self.last_age + np.maximum(extra, 1).astype(np.int64)
+            else:
+                result[beyond] = NEVER
+        return np.maximum(result, age)
+
+
+class EventDrivenSimulator:
+    """
+    Simulador run-to-failure orientado a eventos: em vez de sortear uma
+    chance de falha por máquina por dia, sorteia direto o dia da próxima
+    falha de cada máquina (HazardTable) e pula de falha em falha numa fila
+    de prioridade. O custo cresce com o número de falhas, não com
+    dias x máquinas; o lucro de cada dia sai de arrays de diferenças
+    (um intervalo de operação vira duas somas, não um valor por dia).
+
+    Só vale para políticas que não intervêm (sempre operar, como a coleta
+    sem IA). O lucro diário tem a mesma distribuição do Simulator, mas não
+    os mesmos números: os sorteios vêm de um gerador próprio (semente
+    derivada de `seed`), não dos uniformes por (dia, máquina) do
+    RandomStreams. Com a mesma semente o resultado é reproduzível e não
+    depende de como os dias são divididos entre chamadas de run().
+
+    Expõe logs, stats, daily_events e report() como o ShardedSimulator;
+    não grava detalhes por máquina nem dados de treino.
+    """
+    def __init__(self, machines, seed=None, config=None):
+        self.config = DEFAULT_CONFIG if config is None else config
+        self.machines = machines
+        self.day = 0
+        self.logs = []
+        self.daily_events = [] # Contagem de cada código de evento por dia
+        self.stats = StreamingStats(len(machines))
+        self.ga_state = None # Compatibilidade com Simulator.report
+        self.log_sink = None
+        self.profiler = NULL_PROFILER
+        self.streams = RandomStreams(seed)
+        self.rng = np.random.default_rng(self.streams.seed_for("des"))
+        self.hazard = HazardTable(self.config)
+        self.fleet = FleetState.from_machines(machines)
+
+        fleet = self.fleet
+        self.net_profit = fleet.profit - fleet.cost
+        # Ciclo atual de cada máquina: começa a operar em op_start com idade age_start
+        self.op_start = fleet.unavailable_days.copy()
+        self.age_start = fleet.age.copy()
+        self.last_fail_day = -fleet.last_fail_days
+        self.fail_day = np.empty(fleet.size, dtype=np.int64)
+
+        # Fila de prioridade: dias com falhas marcadas -> índices das máquinas
+        self._heap = []
+        self._buckets = {}
+        self._schedule(np.arange(fleet.size))
+
+    def _schedule(self, idx):
+        """Sorteia a próxima falha das máquinas idx e as coloca na fila."""
+        failure_age = self.hazard.failure_age(self.age_start[idx], self.rng.exponential(size=len(idx)))
+        fail_day = self.op_start[idx] + (failure_age - self.age_start[idx])
+        fail_day[failure_age >= NEVER] = NEVER
+        self.fail_day[idx] = fail_day
+
+        order = np.argsort(fail_day, kind="stable")
+        days, starts = np.unique(fail_day[order], return_index=True)
+        for day, group in zip(days.tolist(), np.split(idx[order], starts[1:])):
+            if day >= NEVER:
+                continue
+            if day not in self._buckets:
+                self._buckets[day] = []
+                heapq.heappush(self._heap, day)
+            self._buckets[day].append(group)
+
+    def _advance(self, n_days):
+        """Simula [self.day, self.day + n_days): lucro e eventos por dia, estado das máquinas."""
+        first, end = self.day, self.day + n_days
+        profit_diff = np.zeros(n_days + 1)
+        point_profit = np.zeros(n_days)
+        running_diff = np.zeros(n_days + 1, dtype=np.int64)
+        busy_diff = np.zeros(n_days + 1, dtype=np.int64)
+        events = np.zeros((n_days, N_EVENTS), dtype=np.int64)
+        repair_costs = self.config.repair_costs_array
+        repair_durations = self.config.repair_durations_array
+        stats = self.stats
+
+        # Reparos (ou indisponibilidade inicial) que já vinham do período anterior
+        busy = np.flatnonzero(self.op_start > first)
+        busy_diff[0] += len(busy)
+        np.add.at(busy_diff, np.minimum(self.op_start[busy], end) - first, -1)
+
+        while self._heap and self._heap[0] < end:
+            day = heapq.heappop(self._heap)
+            idx = np.concatenate(self._buckets.pop(day))
+            k = day - first
+
+            # Operou de op_start até a véspera e falhou hoje
+            start = np.maximum(self.op_start[idx], first)
+            np.add.at(profit_diff, start - first, self.net_profit[idx])
+            profit_diff[k] -= self.net_profit[idx].sum()
+            np.add.at(running_diff, start - first, 1)
+            running_diff[k] -= len(idx)
+
+            fail_type = np.searchsorted(self.config.fail_type_cum_weights, self.rng.random(len(idx)), side="right")
+            repair = repair_costs[fail_type]
+            point_profit[k] -= repair.sum()
+            events[k, EVENT_FALHA_SIMPLES:EVENT_FALHA_SIMPLES + 3] += np.bincount(fail_type, minlength=3)
+            stats.profit_total[idx] += self.net_profit[idx] * (day - start) - repair
+            stats.simples[idx] += fail_type == 0
+            stats.grave[idx] += fail_type == 1
+            stats.total[idx] += fail_type == 2
+            self.fleet.fail_count_simple[idx] += fail_type == 0
+            self.fleet.fail_count_grave[idx] += fail_type == 1
+            self.fleet.fail_count_total[idx] += fail_type == 2
+
+            # Reparo: indisponível por DUR_* dias, depois volta com idade 0
+            self.op_start[idx] = day + 1 + repair_durations[fail_type]
+            self.age_start[idx] = 0
+            self.last_fail_day[idx] = day
+            if k + 1 < n_days:
+                busy_diff[k + 1] += len(idx)
+                np.add.at(busy_diff, np.minimum(self.op_start[idx], end) - first, -1)
+            self._schedule(idx)
+
+        # Ciclos ainda em operação no fim do período
+        running = np.flatnonzero(self.op_start < end)
+        start = np.maximum(self.op_start[running], first)
+        np.add.at(profit_diff, start - first, self.net_profit[running])
+        np.add.at(running_diff, start - first, 1)
+        stats.profit_total[running] += self.net_profit[running] * (end - start)
+
+        daily_profit = np.cumsum(profit_diff)[:n_days] + point_profit
+        events[:, EVENT_OPERANDO] = np.cumsum(running_diff)[:n_days]
+        events[:, EVENT_INDISPONIVEL] = np.cumsum(busy_diff)[:n_days]
+        for profit, day_events in zip(daily_profit.tolist(), events):
+            stats.add_daily_total(profit)
+            self.logs.append((self.day, profit, []))
+            self.daily_events.append(day_events)
+            self.day += 1
+
+    def run(self, days=SIM_DAYS):
+        if days > 0:
+            self._advance(days)
+        self.sync_machines()
+
+    def sync_machines(self):
+        """Estado das máquinas no início de self.day (mesmo significado do Simulator)."""
+        fleet, day = self.fleet, self.day
+        waiting = self.op_start > day
+        fleet.unavailable_days[:] = np.where(waiting, self.op_start - day, 0)
+        fleet.age[:] = np.where(waiting, self.age_start, self.age_start + day - self.op_start)
+        fleet.last_fail_days[:] = day - self.last_fail_day
+        fleet.to_machines(self.machines)
+
+    def report(self, filename_prefix="simulation"):
+        """Mesmo relatório do Simulator (usa logs, stats e day)."""
+        from .simulator import Simulator
+        return Simulator.report(self, filename_prefix)
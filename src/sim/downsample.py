@@ -0,0 +1,72 @@
+# src/sim/downsample.py
+
+import numpy as np
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: escolhe n_out pontos que preservam o
+    formato visual da série. Mantém o primeiro e o último ponto; em cada
+    bucket fica o ponto que forma o maior triângulo com o ponto escolhido
+    no bucket anterior e a média do próximo.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # n_out - 2 buckets entre o primeiro e o último ponto
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    chosen = np.empty(n_out, dtype=np.int64)
+    chosen[0], chosen[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i == n_out - 3:
+            avg_x, avg_y = x[-1], y[-1]
+        else:
+            next_stop = edges[i + 2]
+            avg_x, avg_y = x[stop:next_stop].mean(), y[stop:next_stop].mean()
+        bx, by = x[start:stop], y[start:stop]
+        area = np.abs((x[a] - avg_x) * (by - y[a]) - (x[a] - bx) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        chosen[i + 1] = a
+    return x[chosen], y[chosen]
+
+
+def minmax(x, y, n_out):
+    """
+    Min/max por bucket: n_out // 2 buckets, cada um representado pelo seu
+    mínimo e máximo (em ordem). Preserva picos, bom para séries ruidosas
+    como o lucro diário.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    n_buckets = n_out // 2
+    if n_out >= n or n_buckets < 1:
+        return x, y
+
+    size = -(-n // n_buckets)
+    padded = np.full(n_buckets * size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, size)
+    valid = ~np.all(np.isnan(buckets), axis=1)
+    offsets = np.arange(n_buckets)[valid] * size
+    lo = offsets + np.nanargmin(buckets[valid], axis=1)
+    hi = offsets + np.nanargmax(buckets[valid], axis=1)
+    chosen = np.unique(np.concatenate([lo, hi, [0, n - 1]]))
+    return x[chosen], y[chosen]
+
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": minmax}
+
+
+def downsample(x, y, max_points, method="lttb"):
+    """Reduz (x, y) a no máximo ~max_points pontos (method None ou max_points None: série inteira)."""
+    if method is None or max_points is None or len(x) <= max_points:
+        return np.asarray(x), np.asarray(y)
+    if method not in DOWNSAMPLERS:
+        raise ValueError(f"Método de redução desconhecido: {method}")
+    return DOWNSAMPLERS[method](x, y, max_points)
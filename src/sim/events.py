@@ -0,0 +1,173 @@
+# src/sim/events.py
+
+from collections import deque
+
+import numpy as np
+
+from .fleet import (
+    EVENT_NAMES, EVENT_INDISPONIVEL, EVENT_PARADA_PREVENTIVA,
+    EVENT_FALHA_SIMPLES, EVENT_FALHA_GRAVE, EVENT_FALHA_TOTAL
+)
+
+
+def render_day_log(ids, events, profits, downtime):
+    """Gera as linhas de texto de um dia ("Máquina {id}: {evento}, Lucro: ...")."""
+    lines = []
+    for mid, ev, p, d in zip(ids.tolist(), events.tolist(), profits.tolist(), downtime.tolist()):
+        if ev == EVENT_INDISPONIVEL:
+            event = f"indisponível ({d} dias restantes)"
+        else:
+            event = EVENT_NAMES[ev]
+        lines.append(f"Máquina {mid}: {event}, Lucro: {p:.2f}")
+    return lines
+
+
+class DayDetails:
+    """
+    Detalhes de um dia no formato antigo (lista de strings), mas gerados
+    só quando alguém itera sobre eles. Mantém save_logs e demais
+    consumidores de Simulator.logs funcionando sem formatar nada durante
+    a simulação.
+    """
+    def __init__(self, ids, events, profits, downtime):
+        self._columns = (ids, events, profits, downtime)
+
+    def __iter__(self):
+        return iter(render_day_log(*self._columns))
+
+    def __len__(self):
+        return len(self._columns[0])
+
+    def __getitem__(self, item):
+        return render_day_log(*self._columns)[item]
+
+    def __repr__(self):
+        return repr(render_day_log(*self._columns))
+
+
+class DailyLog:
+    """
+    Simulator.logs: sequência de (dia, lucro, detalhes). Dia e lucro ficam
+    guardados para o horizonte inteiro (dois números por dia), pois VPL,
+    lucro acumulado e gráficos somam a série desde o primeiro dia; só os
+    detalhes ficam limitados aos últimos max_days dias (os anteriores
+    aparecem como lista vazia).
+    """
+    def __init__(self, max_days=None):
+        self.maxlen = max_days
+        self.days = []
+        self.profits = []
+        self._details = deque(maxlen=max_days)
+
+    def append(self, entry):
+        day, profit, details = entry
+        self.days.append(day)
+        self.profits.append(profit)
+        self._details.append(details)
+
+    def __len__(self):
+        return len(self.days)
+
+    def _entry(self, index):
+        offset = len(self.days) - len(self._details)
+        details = self._details[index - offset] if index >= offset else []
+        return self.days[index], self.profits[index], details
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("índice fora do histórico")
+        return self._entry(index)
+
+    def __iter__(self):
+        return (self._entry(i) for i in range(len(self)))
+
+
+class EventRecorder:
+    """
+    Registro colunar dos eventos da simulação: para cada dia guarda
+    arrays de id da máquina, código de evento (ver fleet.EVENT_NAMES),
+    lucro e dias de indisponibilidade. O resumo por máquina e os gráficos
+    agregam direto desses arrays.
+
+    lucro fica em float64 (valores em R$ somados ao longo da simulação);
+    downtime = dias restantes no início do dia para máquinas indisponíveis,
+    ou a duração do reparo para falhas (0 nos demais eventos).
+
+    max_days: guarda só os últimos N dias (None = histórico completo,
+    0 = nenhum dia).
+    """
+    def __init__(self, max_days=None):
+        self.max_days = max_days
+        self.days = deque(maxlen=max_days)
+        self._ids = deque(maxlen=max_days)
+        self._events = deque(maxlen=max_days)
+        self._profits = deque(maxlen=max_days)
+        self._downtime = deque(maxlen=max_days)
+
+    def __len__(self):
+        return len(self.days)
+
+    def record_day(self, day, ids, events, profits, downtime):
+        """Registra os eventos de um dia e retorna os detalhes (preguiçosos)."""
+        columns = (
+            np.asarray(ids, dtype=np.int64),
+            np.asarray(events, dtype=np.int8),
+            np.asarray(profits, dtype=np.float64),
+            np.asarray(downtime, dtype=np.int16),
+        )
+        self.days.append(day)
+        self._ids.append(columns[0])
+        self._events.append(columns[1])
+        self._profits.append(columns[2])
+        self._downtime.append(columns[3])
+        return DayDetails(*columns)
+
+    def render_day(self, index):
+        return render_day_log(self._ids[index], self._events[index],
+                              self._profits[index], self._downtime[index])
+
+    def columns(self):
+        """Todos os eventos concatenados: dict de arrays (dia, máquina, evento, lucro, indisponível)."""
+        if not self.days:
+            empty = np.zeros(0)
+            return {"day": empty.astype(np.int64), "machine_id": empty.astype(np.int64),
+                    "event": empty.astype(np.int8), "profit": empty, "downtime": empty.astype(np.int16)}
+        sizes = [len(ids) for ids in self._ids]
+        return {
+            "day": np.repeat(np.asarray(self.days, dtype=np.int64), sizes),
+            "machine_id": np.concatenate(self._ids),
+            "event": np.concatenate(self._events),
+            "profit": np.concatenate(self._profits),
+            "downtime": np.concatenate(self._downtime),
+        }
+
+    def machine_summary(self, num_machines=None):
+        """
+        Lucro total e contagem de falhas/paradas por máquina.
+        Retorna dict de arrays indexados pelo id da máquina.
+        """
+        cols = self.columns()
+        ids = cols["machine_id"]
+        if num_machines is None:
+            num_machines = int(ids.max()) + 1 if len(ids) else 0
+
+        def count(code):
+            return np.bincount(ids[cols["event"] == code], minlength=num_machines)[:num_machines]
+
+        profit = np.bincount(ids, weights=cols["profit"].astype(np.float64), minlength=num_machines)
+        return {
+            "profit_total": profit[:num_machines],
+            "simples": count(EVENT_FALHA_SIMPLES),
+            "grave": count(EVENT_FALHA_GRAVE),
+            "total": count(EVENT_FALHA_TOTAL),
+            "preventiva": count(EVENT_PARADA_PREVENTIVA),
+        }
+
+    def iter_text(self):
+        """Gera (dia, linhas) renderizando o texto sob demanda."""
+        for day, *columns in zip(self.days, self._ids, self._events, self._profits, self._downtime):
+            yield day, render_day_log(*columns)
@@ -0,0 +1,147 @@
+# src/sim/fleet.py
+
+import numpy as np
+
+from ..config import DEFAULT_CONFIG
+
+# ==================== Códigos de Evento ====================
+EVENT_OPERANDO = 0
+EVENT_INDISPONIVEL = 1
+EVENT_PARADA_PREVENTIVA = 2
+EVENT_FALHA_SIMPLES = 3
+EVENT_FALHA_GRAVE = 4
+EVENT_FALHA_TOTAL = 5
+
+EVENT_NAMES = (
+    "operando",
+    "indisponível",
+    "parada_preventiva",
+    "falha_simples",
+    "falha_grave",
+    "falha_total",
+)
+
+# ==================== Estado da Frota (struct-of-arrays) ====================
+class FleetState:
+    """
+    Estado de todas as máquinas em arrays NumPy, um array por atributo.
+    Permite avançar um dia inteiro da frota com sorteios em lote e
+    atualizações mascaradas, sem laço Python por máquina.
+    """
+    def __init__(self, ids, duration, cost, profit):
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.duration = np.asarray(duration, dtype=np.float64)
+        self.cost = np.asarray(cost, dtype=np.float64)
+        self.profit = np.asarray(profit, dtype=np.float64)
+
+        n = len(self.ids)
+        self.age = np.zeros(n, dtype=np.int64)
+        self.unavailable_days = np.zeros(n, dtype=np.int64)
+        self.last_fail_days = np.zeros(n, dtype=np.int64)
+        self.fail_count_simple = np.zeros(n, dtype=np.int64)
+        self.fail_count_grave = np.zeros(n, dtype=np.int64)
+        self.fail_count_total = np.zeros(n, dtype=np.int64)
+
+    @property
+    def size(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_machines(cls, machines):
+        """Copia o estado de uma lista de Machine para arrays."""
+        fleet = cls(
+            [m.id for m in machines],
+            [m.duration for m in machines],
+            [m.cost for m in machines],
+            [m.profit for m in machines],
+        )
+        fleet.age[:] = [m.age for m in machines]
+        fleet.unavailable_days[:] = [m.unavailable_days for m in machines]
+        fleet.last_fail_days[:] = [m.last_fail_days for m in machines]
+        fleet.fail_count_simple[:] = [m.fail_count_simple for m in machines]
+        fleet.fail_count_grave[:] = [m.fail_count_grave for m in machines]
+        fleet.fail_count_total[:] = [m.fail_count_total for m in machines]
+        return fleet
+
+    def to_machines(self, machines):
+        """Escreve o estado dos arrays de volta nos objetos Machine."""
+        for i, m in enumerate(machines):
+            m.age = int(self.age[i])
+            m.unavailable_days = int(self.unavailable_days[i])
+            m.last_fail_days = int(self.last_fail_days[i])
+            m.fail_count_simple = int(self.fail_count_simple[i])
+            m.fail_count_grave = int(self.fail_count_grave[i])
+            m.fail_count_total = int(self.fail_count_total[i])
+        return machines
+
+    def features(self):
+        """
+        Matriz (máquinas x 6) com as mesmas features coletadas pelo Simulator:
+        idade, dias desde a última falha, lucro, custo, falhas simples e
+        falhas graves + totais.
+        """
+        return np.column_stack((
+            self.age,
+            self.last_fail_days,
+            self.profit,
+            self.cost,
+            self.fail_count_simple,
+            self.fail_count_grave + self.fail_count_total,
+        )).astype(np.float32)
+
+    def step(self, operate, uniforms, config=DEFAULT_CONFIG):
+        """
+        Avança um dia para toda a frota.
+        operate: array booleano (True = operar) ou None (todas operam).
+        uniforms: array (máquinas x 2) do dia, ver RandomStreams.day_uniforms.
+        config: SimulationConfig com as taxas de falha e os custos/durações de reparo.
+        Retorna (lucro por máquina, código de evento, dias indisponíveis, falhou).
+        """
+        n = self.size
+        if operate is None:
+            operate = np.ones(n, dtype=bool)
+
+        u_fail = uniforms[:, 0]
+        u_type = uniforms[:, 1]
+
+        profits = np.zeros(n, dtype=np.float64)
+        events = np.full(n, EVENT_INDISPONIVEL, dtype=np.int8)
+        downtime = self.unavailable_days.copy()
+
+        busy = self.unavailable_days > 0
+        running = ~busy & operate
+        stopped = ~busy & ~operate
+
+        # Máquinas em reparo apenas descontam um dia
+        self.unavailable_days[busy] -= 1
+
+        fail_chance = config.fail_chance(self.age)
+        failed = running & (u_fail < fail_chance)
+        ok = running & ~failed
+
+        # Falhas: tipo sorteado pelos pesos acumulados (config.fail_type_weights)
+        fail_idx = np.flatnonzero(failed)
+        fail_type = np.searchsorted(config.fail_type_cum_weights, u_type[fail_idx], side="right")
+        repair_durations = config.repair_durations_array[fail_type]
+        profits[fail_idx] = -config.repair_costs_array[fail_type]
+        events[fail_idx] = EVENT_FALHA_SIMPLES + fail_type
+        self.unavailable_days[fail_idx] = repair_durations
+        downtime[fail_idx] = repair_durations
+        self.fail_count_simple[fail_idx] += fail_type == 0
+        self.fail_count_grave[fail_idx] += fail_type == 1
+        self.fail_count_total[fail_idx] += fail_type == 2
+        self.age[fail_idx] = 0
+        self.last_fail_days[fail_idx] = 0
+
+        # Operou normalmente
+        profits[ok] = self.profit[ok] - self.cost[ok]
+        events[ok] = EVENT_OPERANDO
+        self.age[ok] += 1
+
+        # Parada preventiva "rejuvenesce" a máquina
+        profits[stopped] = -self.cost[stopped]
+        events[stopped] = EVENT_PARADA_PREVENTIVA
+        self.age[stopped] = 0
+
+        self.last_fail_days += 1
+        return profits, events, downtime, failed
@@ -1,25 +1,40 @@
 import csv
-import matplotlib.pyplot as plt
-import pandas as pd
-import matplotlib.ticker as mticker
 import os
 
+import numpy as np
+
+from .logsink import format_day
+from .downsample import downsample
+from ..config import PLOT_MAX_POINTS, PLOT_DOWNSAMPLE, PLOT_DPI, PLOT_FORMAT
+
+
 # ===================== FUNÇÃO CALCULATE_VPL (ADICIONADA) =====================
+def daily_profits(logs):
+    """Lucro diário dos logs (dia, lucro, detalhes) como array."""
+    if hasattr(logs, "profits"): # DailyLog: a série já está pronta
+        return np.asarray(logs.profits, dtype=np.float64)
+    return np.fromiter((daily_profit for _, daily_profit, _ in logs), dtype=np.float64, count=len(logs))
+
+def calculate_vpl_matrix(profits, discount_rates):
+    """
+    VPL acumulado dia a dia para várias taxas de desconto de uma vez.
+    profits: lucro diário (array ou lista), o primeiro dia é t = 1.
+    discount_rates: escalar ou vetor de taxas anuais.
+    Retorna uma matriz (n_taxas x n_dias); a última coluna é o VPL final
+    de cada taxa (análise de sensibilidade).
+    """
+    profits = np.asarray(profits, dtype=np.float64)
+    rates = np.atleast_1d(np.asarray(discount_rates, dtype=np.float64))
+    t = np.arange(1, len(profits) + 1) / 365
+    # Fator de desconto: 1/(1+r)^t = exp(-t * ln(1+r))
+    discount = np.exp(-np.log1p(rates)[:, None] * t[None, :])
+    return np.cumsum(discount * profits[None, :], axis=1)
+
 def calculate_vpl(logs, discount_rate=0.08):
     """
     Calcula o Valor Presente Líquido acumulado dia a dia
     """
-    daily_profits = [daily_profit for _, daily_profit, _ in logs]
-    vpl_accumulated = []
-    current_vpl = 0
-    
-    for day, profit in enumerate(daily_profits, 1):
-        # Fator de desconto: 1/(1+r)^t
-        discount_factor = 1 / ((1 + discount_rate) ** (day / 365))
-        current_vpl += profit * discount_factor
-        vpl_accumulated.append(current_vpl)
-    
-    return vpl_accumulated
+    return calculate_vpl_matrix(daily_profits(logs), discount_rate)[0]
 
 # ===================== LOGS DETALHADOS =====================
 def save_logs(logs, filename="output/simulation_log.txt"):
@@ -28,18 +43,31 @@ def save_logs(logs, filename="output/simulation_log.txt"):
     
     with open(filename, "w", encoding="utf-8") as f:
         for day, daily_profit, details in logs:
-            f.write(f"Dia {day} -> Lucro líquido: {daily_profit}\n")
-            for d in details:
-                f.write(f"  {d}\n")
-            f.write("\n")
+            f.write(format_day(day, daily_profit, details))
 
 # ===================== RESUMO POR MÁQUINA (CSV) =====================
+def _summary_from_events(events, num_machines):
+    """Resumo por máquina agregado direto dos arrays (EventRecorder ou StreamingStats)."""
+    summary = events.machine_summary(num_machines)
+    return {
+        i: {key: values[i].item() for key, values in summary.items()}
+        for i in range(num_machines)
+    }
+
 def save_machines_csv(logs, filename="output/machines_summary.csv", num_machines=10):
+    """
+    logs: Simulator.events / Simulator.stats (agregado direto dos arrays) ou
+    a lista de logs em texto (formato antigo, interpretado linha a linha).
+    """
     # Criar diretório se não existir
     os.makedirs(os.path.dirname(filename), exist_ok=True)
-    
-    machines_data = {i: {"profit_total": 0, "simples": 0, "grave": 0, "total": 0, "preventiva": 0} 
-                     for i in range(num_machines)}
+
+    if hasattr(logs, "machine_summary"):
+        machines_data = _summary_from_events(logs, num_machines)
+        logs = []
+    else:
+        machines_data = {i: {"profit_total": 0, "simples": 0, "grave": 0, "total": 0, "preventiva": 0}
+                         for i in range(num_machines)}
 
     for _, _, day_logs in logs:
         for log in day_logs:
@@ -71,6 +99,7 @@ def save_machines_csv(logs, filename="output/machines_summary.csv", num_machines
             elif event_part.startswith("parada_preventiva"):
                 machines_data[mid]["preventiva"] += 1
 
+    import pandas as pd # Import tardio: só o resumo em CSV usa pandas
     df = pd.DataFrame.from_dict(machines_data, orient='index')
     df.index.name = "Máquina"
     df.columns = ["Lucro Total", "Falhas Simples", "Falhas Graves", "Falhas Totais", "Paradas Preventivas"]
@@ -79,27 +108,49 @@ def save_machines_csv(logs, filename="output/machines_summary.csv", num_machines
     return df # Retorna o dataframe para ser exibido no Streamlit
 
 # ===================== GRÁFICOS =====================
-def plot_profit(logs, filename=None):
-    days = [day for day, _, _ in logs]
-    profits = [profit for _, profit, _ in logs]
-    cumulative_profits = []
-    current_total = 0
-    
-    for profit in profits:
-        current_total += profit
-        cumulative_profits.append(current_total)
-    
+def _pyplot():
+    """
+    Importa o matplotlib só quando um gráfico é desenhado (simular não
+    precisa dele). Sem janelas: os gráficos só vão para arquivo/Streamlit.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as mticker
+    return plt, mticker
+
+def _plot_series(x, y, max_points=PLOT_MAX_POINTS, method=PLOT_DOWNSAMPLE):
+    """Série pronta para desenhar: reduzida a ~max_points mantendo o formato."""
+    return downsample(x, y, max_points, method)
+
+def save_figure(fig, filename, dpi=PLOT_DPI, fmt=PLOT_FORMAT):
+    """Salva a figura com a resolução e o formato configurados (a extensão segue fmt)."""
+    root, _ = os.path.splitext(filename)
+    filename = f"{root}.{fmt}"
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fig.savefig(filename, dpi=dpi, format=fmt, bbox_inches='tight')
+    return filename
+
+def plot_profit(logs, filename=None, max_points=PLOT_MAX_POINTS, dpi=PLOT_DPI, fmt=PLOT_FORMAT):
+    days = np.fromiter((day for day, _, _ in logs), dtype=np.float64, count=len(logs))
+    profits = daily_profits(logs)
+    cumulative_profits = np.cumsum(profits)
+
+    plt, mticker = _pyplot()
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
     
-    # Gráfico de lucro diário
-    ax1.plot(days, profits, color='blue', alpha=0.7, linewidth=1)
+    # Gráfico de lucro diário (ruidoso: min/max preserva os picos de falha)
+    daily_method = "minmax" if PLOT_DOWNSAMPLE else None
+    ax1.plot(*_plot_series(days, profits, max_points, daily_method), color='blue', alpha=0.7, linewidth=1)
     ax1.set_title("Lucro Diário")
     ax1.set_xlabel("Dia")
     ax1.set_ylabel("Lucro Diário (R$)")
     ax1.grid(True, linestyle='--', alpha=0.7)
     
     # Gráfico de lucro acumulado
-    ax2.plot(days, cumulative_profits, color='green', linewidth=2)
+    ax2.plot(*_plot_series(days, cumulative_profits, max_points), color='green', linewidth=2)
     ax2.set_title("Lucro Acumulado")
     ax2.set_xlabel("Dia")
     ax2.set_ylabel("Lucro Acumulado (R$)")
@@ -112,12 +163,16 @@ def plot_profit(logs, filename=None):
     plt.tight_layout()
 
     if filename:
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        fig.savefig(filename, dpi=300, bbox_inches='tight')
+        save_figure(fig, filename, dpi, fmt)
     return fig
 
-def plot_machine_performance(logs, num_machines=10, filename=None):
-    machines_data = {i: 0 for i in range(num_machines)}
+def plot_machine_performance(logs, num_machines=10, filename=None, dpi=PLOT_DPI, fmt=PLOT_FORMAT):
+    if hasattr(logs, "machine_summary"):
+        profit_total = logs.machine_summary(num_machines)["profit_total"]
+        machines_data = dict(enumerate(profit_total.tolist()))
+        logs = []
+    else:
+        machines_data = {i: 0 for i in range(num_machines)}
     for _, _, day_logs in logs:
         for log in day_logs:
             # CORRIGIDO: Procurar por "Lucro:" em vez de "lucro líquido"
@@ -130,6 +185,7 @@ def plot_machine_performance(logs, num_machines=10, filename=None):
                 except (IndexError, ValueError):
                     continue
     
+    plt, mticker = _pyplot()
     fig, ax = plt.subplots(figsize=(12, 6))
     ax.bar(machines_data.keys(), machines_data.values(), color='skyblue', edgecolor='black')
     ax.set_title("Lucro Líquido Acumulado por Máquina")
@@ -143,16 +199,17 @@ def plot_machine_performance(logs, num_machines=10, filename=None):
     plt.tight_layout()
 
     if filename:
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        fig.savefig(filename, dpi=300, bbox_inches='tight')
+        save_figure(fig, filename, dpi, fmt)
     return fig
 
-def plot_vpl(logs, discount_rate=0.08, filename=None):
+def plot_vpl(logs, discount_rate=0.08, filename=None, max_points=PLOT_MAX_POINTS, dpi=PLOT_DPI,
+             fmt=PLOT_FORMAT):
     vpl_values = calculate_vpl(logs, discount_rate)
-    days = list(range(1, len(vpl_values) + 1))
+    days = np.arange(1, len(vpl_values) + 1)
     
+    plt, mticker = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(days, vpl_values, color='purple', linewidth=2)
+    ax.plot(*_plot_series(days, vpl_values, max_points), color='purple', linewidth=2)
     ax.set_xlabel('Dias')
     ax.set_ylabel('Valor Presente Líquido (R$)')
     ax.set_title('Evolução do Valor Presente Líquido (VPL)')
@@ -164,25 +221,27 @@ def plot_vpl(logs, discount_rate=0.08, filename=None):
     plt.tight_layout()
 
     if filename:
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        fig.savefig(filename, dpi=300, bbox_inches='tight')
+        save_figure(fig, filename, dpi, fmt)
     return fig
 
-def plot_vpl_comparativo(logs_ai, logs_no_ai, discount_rate=0.08, filename_prefix="vpl_comparativo", save_to_file=True):
+def plot_vpl_comparativo(logs_ai, logs_no_ai, discount_rate=0.08, filename_prefix="vpl_comparativo", save_to_file=True,
+                         max_points=PLOT_MAX_POINTS, dpi=PLOT_DPI, fmt=PLOT_FORMAT):
     """
     Gera gráfico comparativo de VPL
     save_to_file: Se True, salva em arquivo. Se False, apenas retorna a figura.
+    dpi/fmt: resolução e formato do arquivo (ver save_figure).
     """
     # Cálculos do VPL
     vpl_ai = calculate_vpl(logs_ai, discount_rate)
     vpl_no_ai = calculate_vpl(logs_no_ai, discount_rate)
     
     # Criação do gráfico
+    plt, mticker = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 6))
-    days = list(range(1, len(vpl_ai) + 1))
+    days = np.arange(1, len(vpl_ai) + 1)
     
-    ax.plot(days, vpl_ai, label='Com IA', color='green', linewidth=2)
-    ax.plot(days, vpl_no_ai, label='Sem IA', color='red', linewidth=2)
+    ax.plot(*_plot_series(days, vpl_ai, max_points), label='Com IA', color='green', linewidth=2)
+    ax.plot(*_plot_series(days[:len(vpl_no_ai)], vpl_no_ai, max_points), label='Sem IA', color='red', linewidth=2)
     
     # Configurações do gráfico
     ax.set_xlabel('Dias')
@@ -198,8 +257,7 @@ def plot_vpl_comparativo(logs_ai, logs_no_ai, discount_rate=0.08, filename_prefi
     
     # Salva apenas se solicitado
     if save_to_file:
-        os.makedirs('output', exist_ok=True)
-        fig.savefig(f"output/{filename_prefix}.png", dpi=300, bbox_inches='tight')
+        save_figure(fig, f"output/{filename_prefix}.png", dpi, fmt)
     
     return fig  # ⬅️ SEMPRE retorna a figura para o Streamlit
 
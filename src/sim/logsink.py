@@ -0,0 +1,160 @@
+# src/sim/logsink.py
+
+import os
+import gzip
+import queue
+import threading
+
+COMPRESS_LEVEL = 6   # Nível do gzip (1 = rápido, 9 = menor)
+QUEUE_DAYS = 256     # Dias enfileirados antes de a simulação esperar o disco
+WRITE_BATCH_DAYS = 32 # Dias juntados em cada escrita
+
+
+def format_day(day, daily_profit, details):
+    """Texto de um dia no formato de save_logs."""
+    lines = [f"Dia {day} -> Lucro líquido: {daily_profit}\n"]
+    lines.extend(f"  {d}\n" for d in details)
+    lines.append("\n")
+    return "".join(lines)
+
+
+class LogSink:
+    """
+    Escrita do log detalhado em streaming, durante a simulação.
+
+    write_day só enfileira (dia, lucro, detalhes); uma thread formata o
+    texto (os DayDetails são renderizados lá) e grava em lotes. A fila é
+    limitada: se o disco não acompanhar, a simulação espera em vez de
+    acumular o histórico em memória.
+
+    path: arquivo de saída (ex.: output/with_ai_log.txt). Com compress=True
+    ganha o sufixo .gz. Com max_bytes (tamanho do texto) ou days_per_file,
+    o log é dividido em partes: with_ai_log.0000.txt, with_ai_log.0001.txt, ...
+    self.files lista os arquivos gerados.
+
+    Use como context manager ou chame close() no fim para esvaziar a fila.
+    """
+    def __init__(self, path, compress=False, max_bytes=None, days_per_file=None,
+                 compress_level=COMPRESS_LEVEL, queue_days=QUEUE_DAYS):
+        self.path = path
+        self.compress = compress
+        self.max_bytes = max_bytes
+        self.days_per_file = days_per_file
+        self.compress_level = compress_level
+        self.files = []
+
+        self._queue = queue.Queue(maxsize=queue_days)
+        self._file = None
+        self._part = 0
+        self._part_first_day = None
+        self._bytes = 0
+        self._error = None
+        self._closed = False
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_day(self, day, daily_profit, details):
+        """Enfileira um dia (mesma tupla de Simulator.logs)."""
+        if self._error is not None:
+            raise self._error
+        if self._closed:
+            raise ValueError("LogSink já foi fechado")
+        self._queue.put((day, daily_profit, details))
+
+    def close(self):
+        """Espera a fila esvaziar, fecha o arquivo e repassa erros da thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    # ----- Thread de escrita -----
+    def _part_path(self):
+        base = self.path
+        if self.max_bytes is not None or self.days_per_file is not None:
+            stem, ext = os.path.splitext(base)
+            base = f"{stem}.{self._part:04d}{ext}"
+        return base + ".gz" if self.compress else base
+
+    def _open_part(self, day):
+        path = self._part_path()
+        if self.compress:
+            self._file = gzip.open(path, "wb", compresslevel=self.compress_level)
+        else:
+            self._file = open(path, "wb")
+        self.files.append(path)
+        self._part_first_day = day
+        self._bytes = 0
+
+    def _needs_rotation(self, day):
+        if self._file is None:
+            return False
+        if self.max_bytes is not None and self._bytes >= self.max_bytes:
+            return True
+        if self.days_per_file is not None and day - self._part_first_day >= self.days_per_file:
+            return True
+        return False
+
+    def _write(self, chunks):
+        data = "".join(chunks).encode("utf-8")
+        self._file.write(data)
+        self._bytes += len(data)
+
+    def _writer(self):
+        try:
+            done = False
+            while not done:
+                # Bloqueia pelo primeiro dia e junta o que mais já estiver na fila
+                batch = [self._queue.get()]
+                while len(batch) < WRITE_BATCH_DAYS:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                chunks = []
+                for item in batch:
+                    if item is None:
+                        done = True
+                        break
+                    day = item[0]
+                    if self._file is None or self._needs_rotation(day):
+                        if chunks:
+                            self._write(chunks)
+                            chunks = []
+                        if self._file is not None:
+                            self._file.close()
+                            self._part += 1
+                        self._open_part(day)
+                    chunks.append(format_day(*item))
+                    if self.max_bytes is not None:
+                        # Rotação por tamanho precisa do total a cada dia
+                        self._write(chunks)
+                        chunks = []
+                if chunks:
+                    self._write(chunks)
+        except BaseException as exc: # Repassado na próxima write_day/close
+            self._error = exc
+            # Esvazia a fila para não travar a simulação em put()
+            while True:
+                try:
+                    if self._queue.get(timeout=0.1) is None:
+                        break
+                except queue.Empty:
+                    if self._closed:
+                        break
+        finally:
+            if self._file is not None:
+                self._file.close()
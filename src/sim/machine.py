@@ -1,5 +1,5 @@
 import random
-from ..config import NUM_MACHINES, DURATION_RANGE, COST_RANGE, PROFIT_RANGE
+from ..config import DEFAULT_CONFIG
 
 
 class Machine:
@@ -95,11 +95,16 @@ class Machine:
                 f"Fails: S={self.fail_count_simple}, G={self.fail_count_grave}, T={self.fail_count_total})")
 
 
-def create_random_machines(n=NUM_MACHINES):
+def create_random_machines(n=None, rng=random, config=DEFAULT_CONFIG):
+    """
+    rng: gerador com a API de random (ex.: random.Random(semente)) para frotas reproduzíveis.
+    config: SimulationConfig com as faixas de duração, custo e lucro (n padrão: config.num_machines).
+    """
+    n = config.num_machines if n is None else n
     machines = []
     for i in range(n):
-        duration = random.randint(*DURATION_RANGE)
-        cost = random.randint(*COST_RANGE)
-        profit = random.randint(*PROFIT_RANGE)
+        duration = rng.randint(*config.duration_range)
+        cost = rng.randint(*config.cost_range)
+        profit = rng.randint(*config.profit_range)
         machines.append(Machine(i, duration, cost, profit))
     return machines
\ No newline at end of file
@@ -0,0 +1,144 @@
+# src/sim/profiling.py
+
+import os
+import json
+import time
+from bisect import bisect_left
+
+# Limites dos buckets dos histogramas (segundos): 1 µs a 100 s, 4 por década
+BUCKET_EDGES = tuple(10 ** (k / 4) for k in range(-24, 9))
+
+
+class _NullPhase:
+    """Fase que não mede nada (profiler desligado)."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.profiler._stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = self.profiler._stack
+        self.profiler.record("/".join(stack), elapsed)
+        stack.pop()
+        return False
+
+
+class Profiler:
+    """
+    Instrumentação por fase da simulação: tempo acumulado, número de
+    chamadas e histograma de latências de cada fase.
+
+        with profiler.phase("decide"):
+            ...
+
+    Fases aninhadas ganham o caminho completo ("day/decide/evaluate"),
+    então o tempo de uma fase inclui o das suas filhas. Desligado
+    (enabled=False, ou o NULL_PROFILER), phase() devolve um context manager
+    vazio e o custo é só o de uma chamada de método.
+
+    export_prefix: com ele, export() grava {prefix}_profile.json e
+    {prefix}_profile.txt (o Simulator chama no fim de run e de report).
+    """
+    def __init__(self, enabled=True, export_prefix=None):
+        self.enabled = enabled
+        self.export_prefix = export_prefix
+        self._stack = []
+        self._phases = {} # nome -> [chamadas, total, máximo, contagens por bucket]
+
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def record(self, name, seconds):
+        """Registra uma medida já feita (em segundos) para a fase `name`."""
+        if not self.enabled:
+            return
+        entry = self._phases.get(name)
+        if entry is None:
+            entry = self._phases[name] = [0, 0.0, 0.0, [0] * (len(BUCKET_EDGES) + 1)]
+        entry[0] += 1
+        entry[1] += seconds
+        if seconds > entry[2]:
+            entry[2] = seconds
+        entry[3][bisect_left(BUCKET_EDGES, seconds)] += 1
+
+    def reset(self):
+        self._phases.clear()
+
+    @staticmethod
+    def _percentile(counts, total, maximum, q):
+        """Percentil aproximado pelo limite superior do bucket (nunca acima do máximo)."""
+        target = q * total
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= target and count:
+                return min(BUCKET_EDGES[min(i, len(BUCKET_EDGES) - 1)], maximum)
+        return maximum
+
+    def summary(self):
+        """dict nome -> métricas (segundos), com as fases filhas logo após a mãe."""
+        result = {}
+        for name in sorted(self._phases, key=lambda n: n.split("/")):
+            count, total, maximum, counts = self._phases[name]
+            result[name] = {
+                "count": count,
+                "total_s": total,
+                "mean_s": total / count,
+                "p50_s": self._percentile(counts, count, maximum, 0.50),
+                "p90_s": self._percentile(counts, count, maximum, 0.90),
+                "p99_s": self._percentile(counts, count, maximum, 0.99),
+                "max_s": maximum,
+                "histogram": {f"{edge:.3g}": c for edge, c in zip(BUCKET_EDGES + (float("inf"),), counts) if c},
+            }
+        return result
+
+    def to_text(self):
+        """Tabela de métricas por fase (uma linha por fase, filhas indentadas)."""
+        lines = [f"{'fase':<40} {'chamadas':>9} {'total (s)':>11} {'média (ms)':>11} "
+                 f"{'p50 (ms)':>10} {'p99 (ms)':>10} {'máx (ms)':>10}"]
+        for name, m in self.summary().items():
+            label = "  " * name.count("/") + name.rsplit("/", 1)[-1]
+            lines.append(f"{label:<40} {m['count']:>9} {m['total_s']:>11.3f} {m['mean_s'] * 1000:>11.3f} "
+                         f"{m['p50_s'] * 1000:>10.3f} {m['p99_s'] * 1000:>10.3f} {m['max_s'] * 1000:>10.3f}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, prefix=None):
+        """Grava o JSON e o texto das métricas; retorna os caminhos (ou None se não houver destino)."""
+        prefix = prefix or self.export_prefix
+        if not self.enabled or prefix is None:
+            return None
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        json_path, text_path = f"{prefix}_profile.json", f"{prefix}_profile.txt"
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"bucket_edges_s": BUCKET_EDGES, "phases": self.summary()}, f, indent=2)
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write(self.to_text())
+        return json_path, text_path
+
+
+# Profiler desligado compartilhado (padrão do Simulator)
+NULL_PROFILER = Profiler(enabled=False)
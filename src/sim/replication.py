@@ -0,0 +1,236 @@
+# src/sim/replication.py
+
+import os
+import io
+import math
+import copy
+import random
+import queue
+import argparse
+import contextlib
+import multiprocessing as mp
+
+import numpy as np
+
+from .machine import create_random_machines
+from ..config import NUM_MACHINES
+
+# Cada replicação roda o pipeline completo: coleta -> treino -> comparação
+COLLECT_DAYS = 365
+TRAIN_EPOCHS = 50
+
+
+# ==================== Pipeline de Uma Replicação ====================
+def train_predictor(training_data, epochs=TRAIN_EPOCHS, seed=None):
+    """
+    Treina um MachinePredictor novo com os dados coletados (sem tocar no modelo global).
+    training_data: TrainingBuffer do coletor.
+    seed: semente do embaralhamento do treino (None = gerador padrão do torch).
+    """
+    from src.nn.rede_neural import MachinePredictor, train_fast
+
+    features_tensor, labels_tensor = training_data.to_tensors()
+
+    predictor = MachinePredictor()
+    with contextlib.redirect_stdout(io.StringIO()): # Silencia o log de épocas
+        train_fast(predictor, features_tensor, labels_tensor, epochs=epochs, seed=seed)
+    return predictor
+
+
+def run_replication(seed, days, num_machines=NUM_MACHINES, engine="loop", epochs=TRAIN_EPOCHS,
+                    common_random_numbers=True):
+    """
+    Executa uma replicação independente e semeada do pipeline
+    coleta -> treino -> comparação com/sem IA.
+    Com common_random_numbers, as duas políticas usam a mesma semente de
+    simulação e enfrentam as mesmas falhas: a diferença entre elas fica
+    bem menos ruidosa.
+    Retorna um dict com lucro total e VPL de cada política.
+    """
+    import torch
+    from .simulator import Simulator
+
+    torch.manual_seed(seed)
+    collect_seed, ai_seed, no_ai_seed, train_seed = np.random.SeedSequence(seed).spawn(4)
+    if common_random_numbers:
+        no_ai_seed = ai_seed
+
+    initial_machines = create_random_machines(num_machines, rng=random.Random(seed))
+
+    collector = Simulator(copy.deepcopy(initial_machines), use_ai=False, engine=engine,
+                          seed=collect_seed, history_days=0)
+    collector.run(days=COLLECT_DAYS)
+    predictor = train_predictor(collector.training_data, epochs=epochs,
+                                seed=int(train_seed.generate_state(1)[0]))
+
+    sim_ai = Simulator(copy.deepcopy(initial_machines), use_ai=True, engine=engine,
+                       seed=ai_seed, history_days=0, model=predictor)
+    sim_ai.run(days=days)
+
+    sim_no_ai = Simulator(copy.deepcopy(initial_machines), use_ai=False, engine=engine,
+                          seed=no_ai_seed, history_days=0)
+    sim_no_ai.run(days=days)
+
+    return {
+        "seed": seed,
+        "profit_ai": sim_ai.stats.total_profit,
+        "profit_no_ai": sim_no_ai.stats.total_profit,
+        "vpl_ai": sim_ai.stats.vpl,
+        "vpl_no_ai": sim_no_ai.stats.vpl,
+    }
+
+
+# ==================== Resultados e Intervalos de Confiança ====================
+def _student_t_cdf(t, df):
+    """P(T <= t) da t de Student com df inteiro (Abramowitz & Stegun 26.7.3 e 26.7.4)."""
+    theta = math.atan(t / math.sqrt(df))
+    s, c2 = math.sin(theta), math.cos(theta) ** 2
+    term, total = 1.0, 1.0
+    if df % 2:
+        for k in range(3, df, 2): # 1 + (2/3)c² + (2·4)/(3·5)c⁴ + ...
+            term *= (k - 1) / k * c2
+            total += term
+        a = 2 / math.pi * (theta + (s * math.sqrt(c2) * total if df > 1 else 0.0))
+    else:
+        for k in range(2, df, 2): # 1 + (1/2)c² + (1·3)/(2·4)c⁴ + ...
+            term *= (k - 1) / k * c2
+            total += term
+        a = s * total
+    return 0.5 + a / 2
+
+
+def student_t_quantile(p, df):
+    """Quantil p da t de Student com df graus de liberdade (bisseção na CDF)."""
+    low, high = 0.0, 1.0
+    while _student_t_cdf(high, df) < p:
+        high *= 2
+    for _ in range(100):
+        mid = (low + high) / 2
+        if _student_t_cdf(mid, df) < p:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+
+class ReplicationResults:
+    """
+    Distribuições de lucro total e VPL das replicações.
+    Métricas: profit_ai, profit_no_ai, vpl_ai, vpl_no_ai e as diferenças
+    profit_diff / vpl_diff (com IA - sem IA).
+    """
+    METRICS = ("profit_ai", "profit_no_ai", "vpl_ai", "vpl_no_ai", "profit_diff", "vpl_diff")
+
+    def __init__(self, confidence=0.95):
+        self.confidence = confidence
+        self.records = []
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, record):
+        self.records.append(record)
+
+    def values(self, metric):
+        if metric == "profit_diff":
+            return self.values("profit_ai") - self.values("profit_no_ai")
+        if metric == "vpl_diff":
+            return self.values("vpl_ai") - self.values("vpl_no_ai")
+        return np.array([r[metric] for r in self.records], dtype=np.float64)
+
+    def confidence_interval(self, metric):
+        """(média, limite inferior, limite superior) pela t de Student (n - 1 graus de liberdade)."""
+        values = self.values(metric)
+        mean = float(values.mean()) if len(values) else float("nan")
+        if len(values) < 2:
+            return mean, float("-inf"), float("inf")
+        t = student_t_quantile(0.5 + self.confidence / 2, len(values) - 1)
+        half_width = t * float(values.std(ddof=1)) / np.sqrt(len(values))
+        return mean, mean - half_width, mean + half_width
+
+    def half_width(self, metric):
+        _, low, high = self.confidence_interval(metric)
+        return (high - low) / 2
+
+    def summary(self):
+        return {metric: self.confidence_interval(metric) for metric in self.METRICS}
+
+
+# ==================== Execução Paralela ====================
+def _init_worker():
+    # Um processo por núcleo: evita que cada worker abra vários threads do torch
+    import torch
+    torch.set_num_threads(1)
+
+
+def run_replications(n, days, base_seed=0, num_machines=NUM_MACHINES, engine="loop",
+                     epochs=TRAIN_EPOCHS, max_workers=None, confidence=0.95,
+                     target_half_width=None, stop_metric="vpl_diff", min_replications=5,
+                     common_random_numbers=True):
+    """
+    Roda até n replicações (sementes base_seed, base_seed + 1, ...) em um
+    pool de processos que usa todos os núcleos.
+
+    Se target_half_width for dado, para assim que o intervalo de confiança
+    de stop_metric tiver meia-largura (em R$) menor ou igual ao alvo,
+    com pelo menos min_replications concluídas; as replicações ainda não
+    iniciadas não são enviadas e os processos das que estão rodando são
+    encerrados (terminate), sem gastar CPU com replicações descartadas.
+    """
+    results = ReplicationResults(confidence)
+    max_workers = max_workers or os.cpu_count() or 1
+    seeds = iter(range(base_seed, base_seed + n))
+
+    finished = queue.Queue() # Resultados (ou exceções) na ordem em que terminam
+    pool = mp.Pool(max_workers, initializer=_init_worker)
+    try:
+        def submit_next():
+            seed = next(seeds, None)
+            if seed is None:
+                return 0
+            pool.apply_async(run_replication, (seed, days, num_machines, engine, epochs,
+                                               common_random_numbers),
+                             callback=finished.put, error_callback=finished.put)
+            return 1
+
+        running = sum(submit_next() for _ in range(max_workers))
+        while running:
+            record = finished.get()
+            running -= 1
+            if isinstance(record, BaseException):
+                raise record
+            results.add(record)
+
+            if (target_half_width is not None and len(results) >= min_replications
+                    and results.half_width(stop_metric) <= target_half_width):
+                break
+            running += submit_next()
+    finally:
+        # terminate mata os workers: replicações em andamento não seguem rodando até o fim
+        pool.terminate()
+        pool.join()
+
+    results.records.sort(key=lambda r: r["seed"])
+    return results
+
+
+# ==================== BLOCO DE EXECUÇÃO PRINCIPAL ====================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replicações Monte Carlo da comparação com/sem IA")
+    parser.add_argument("--n", type=int, default=20, help="número máximo de replicações")
+    parser.add_argument("--days", type=int, default=2 * 365, help="dias de cada simulação comparativa")
+    parser.add_argument("--seed", type=int, default=0, help="semente da primeira replicação")
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--engine", choices=("loop", "vector"), default="loop")
+    parser.add_argument("--target", type=float, default=None,
+                        help="meia-largura alvo (R$) do IC da diferença de VPL para parar antes")
+    parser.add_argument("--independent", action="store_true",
+                        help="sorteios independentes por política (sem números aleatórios comuns)")
+    args = parser.parse_args()
+
+    res = run_replications(args.n, args.days, base_seed=args.seed, engine=args.engine,
+                           max_workers=args.workers, target_half_width=args.target,
+                           common_random_numbers=not args.independent)
+    print(f"{len(res)} replicações concluídas (IC de {res.confidence:.0%})")
+    for metric, (mean, low, high) in res.summary().items():
+        print(f"{metric:>13}: R$ {mean:,.2f}  [{low:,.2f}, {high:,.2f}]")
@@ -0,0 +1,52 @@
+# src/sim/rng.py
+
+import zlib
+
+import numpy as np
+
+# Máquinas por bloco de sorteio: cada bloco tem seu próprio gerador por dia
+BLOCK_SIZE = 1024
+
+# Identificadores dos fluxos (entram na chave de cada gerador)
+STREAM_FAILURE = 0
+STREAM_DERIVED = 1
+
+
+class RandomStreams:
+    """
+    Fluxos aleatórios explícitos e semeados, de propriedade do Simulator.
+
+    Os sorteios de falha são indexados por (dia, máquina): a máquina i no
+    dia d sempre recebe os mesmos dois uniformes (chance de falha, tipo de
+    falha), independentemente da política, do tamanho da frota ou do que
+    as outras máquinas fizeram. Assim várias políticas rodadas com a mesma
+    semente veem as mesmas falhas subjacentes (números aleatórios comuns),
+    e a diferença entre elas tem variância muito menor.
+    """
+    def __init__(self, seed=None):
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence = seed
+        self._key = [int(k) for k in seed.generate_state(4)]
+
+    def _generator(self, stream, *counters):
+        return np.random.default_rng(self._key + [stream, *counters])
+
+    def day_uniforms(self, day, start=0, stop=None):
+        """
+        Uniformes do dia para as máquinas de índice start..stop-1.
+        Retorna array (stop - start, 2): coluna 0 decide a falha, coluna 1 o tipo.
+        """
+        if stop is None:
+            stop = start + BLOCK_SIZE
+        first, last = start // BLOCK_SIZE, (stop - 1) // BLOCK_SIZE
+        blocks = [self._generator(STREAM_FAILURE, day, b).random((BLOCK_SIZE, 2))
+                  for b in range(first, last + 1)]
+        draws = blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+        offset = first * BLOCK_SIZE
+        return draws[start - offset:stop - offset]
+
+    def seed_for(self, *key):
+        """Semente inteira derivada, ex.: seed_for("ga", dia) para o AG do dia."""
+        words = [zlib.crc32(k.encode()) if isinstance(k, str) else int(k) for k in key]
+        return int(self._generator(STREAM_DERIVED, *words).integers(2**63))
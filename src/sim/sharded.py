@@ -0,0 +1,226 @@
+# src/sim/sharded.py
+
+import os
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .fleet import FleetState, EVENT_NAMES
+from .rng import RandomStreams, BLOCK_SIZE
+from .stats import StreamingStats
+from .profiling import NULL_PROFILER
+from ..config import SIM_DAYS, DEFAULT_CONFIG
+
+# Campos da frota mantidos em memória compartilhada (nome, dtype)
+_FLEET_FIELDS = (
+    ("ids", np.int64),
+    ("duration", np.float64),
+    ("cost", np.float64),
+    ("profit", np.float64),
+    ("age", np.int64),
+    ("unavailable_days", np.int64),
+    ("last_fail_days", np.int64),
+    ("fail_count_simple", np.int64),
+    ("fail_count_grave", np.int64),
+    ("fail_count_total", np.int64),
+    ("profit_total", np.float64), # Lucro acumulado por máquina (para o resumo)
+)
+
+N_EVENTS = len(EVENT_NAMES)
+
+
+def _attach(spec):
+    """Abre os blocos de memória compartilhada descritos em spec -> (handles, arrays)."""
+    handles, arrays = [], {}
+    for key, (name, shape, dtype) in spec.items():
+        shm = SharedMemory(name=name)
+        handles.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return handles, arrays
+
+
+def _fleet_view(arrays, start, stop):
+    """FleetState cujos arrays são fatias (views) da memória compartilhada."""
+    fleet = FleetState.__new__(FleetState)
+    for key, _ in _FLEET_FIELDS:
+        if key != "profit_total":
+            setattr(fleet, key, arrays[key][start:stop])
+    return fleet
+
+
+def _shard_worker(conn, spec, shard, start, stop, seed_sequence, config):
+    """
+    Processo de um shard: avança as máquinas [start, stop) quando o
+    coordenador manda (primeiro_dia, n_dias) e escreve o lucro e a
+    contagem de eventos de cada dia nos buffers compartilhados.
+    """
+    handles, arrays = _attach(spec)
+    try:
+        fleet = _fleet_view(arrays, start, stop)
+        profit_total = arrays["profit_total"][start:stop]
+        daily_profit = arrays["daily_profit"]
+        daily_events = arrays["daily_events"]
+        streams = RandomStreams(seed_sequence)
+
+        while True:
+            command = conn.recv()
+            if command is None:
+                break
+            first_day, n_days = command
+            for k in range(n_days):
+                uniforms = streams.day_uniforms(first_day + k, start, stop)
+                profits, events, _, _ = fleet.step(None, uniforms, config)
+                profit_total += profits
+                daily_profit[k, shard] = profits.sum()
+                daily_events[k, shard] = np.bincount(events, minlength=N_EVENTS)
+            conn.send(n_days)
+    finally:
+        del fleet, profit_total, daily_profit, daily_events, arrays
+        for shm in handles:
+            shm.close()
+
+
+class ShardedSimulator:
+    """
+    Simulador run-to-failure para frotas muito grandes, dividido entre
+    processos. O estado das máquinas fica em memória compartilhada; cada
+    worker avança sua fatia da frota e o coordenador sincroniza todos a
+    cada bloco de `block_days` dias, somando lucro diário e eventos.
+
+    Com a mesma semente, o lucro diário é idêntico ao de
+    Simulator(engine="vector"): cada máquina consome os mesmos sorteios
+    de RandomStreams, independentemente do shard em que está.
+    Expõe logs, stats e report() como o Simulator (os detalhes diários por
+    máquina não são guardados; veja daily_events para as contagens).
+
+    Use como context manager (ou chame close()) para encerrar os workers.
+    config: SimulationConfig do cenário (padrão: DEFAULT_CONFIG).
+    """
+    def __init__(self, machines, n_workers=None, seed=None, block_days=30, config=None):
+        self.config = DEFAULT_CONFIG if config is None else config
+        self.machines = machines
+        self.day = 0
+        self.block_days = block_days
+        self.logs = []
+        self.daily_events = [] # Contagem de cada código de evento por dia
+        self.ga_state = None # Compatibilidade com Simulator.report
+        self.log_sink = None
+        self.profiler = NULL_PROFILER
+        self.streams = RandomStreams(seed)
+
+        n = len(machines)
+        fleet = FleetState.from_machines(machines)
+        self._initial_fails = (fleet.fail_count_simple.copy(), fleet.fail_count_grave.copy(),
+                               fleet.fail_count_total.copy())
+
+        # Shards alinhados aos blocos de sorteio do RandomStreams
+        n_blocks = -(-n // BLOCK_SIZE)
+        n_workers = max(1, min(n_workers or os.cpu_count() or 1, n_blocks))
+        blocks_per_shard = -(-n_blocks // n_workers)
+        bounds = [min(n, i * blocks_per_shard * BLOCK_SIZE) for i in range(n_workers + 1)]
+        self._bounds = [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+        # Memória compartilhada
+        self._handles = []
+        self._spec = {}
+        layout = [(key, (n,), dtype) for key, dtype in _FLEET_FIELDS]
+        layout.append(("daily_profit", (block_days, len(self._bounds)), np.float64))
+        layout.append(("daily_events", (block_days, len(self._bounds), N_EVENTS), np.int64))
+        self._arrays = {}
+        for key, shape, dtype in layout:
+            nbytes = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            shm = SharedMemory(create=True, size=nbytes)
+            self._handles.append(shm)
+            self._spec[key] = (shm.name, shape, dtype)
+            self._arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        for key, _ in _FLEET_FIELDS:
+            if key == "profit_total":
+                self._arrays[key][:] = 0.0
+            else:
+                self._arrays[key][:] = getattr(fleet, key)
+
+        self.fleet = _fleet_view(self._arrays, 0, n)
+        self.stats = StreamingStats(n)
+        self.stats.profit_total = self._arrays["profit_total"]
+
+        # Workers
+        ctx = mp.get_context("spawn")
+        self._workers = []
+        for shard, (start, stop) in enumerate(self._bounds):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_shard_worker, daemon=True,
+                               args=(child, self._spec, shard, start, stop,
+                                     self.streams.seed_sequence, self.config))
+            proc.start()
+            self._workers.append((proc, parent))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _advance(self, n_days):
+        for _, conn in self._workers:
+            conn.send((self.day, n_days))
+        for _, conn in self._workers:
+            conn.recv()
+
+        # Redução no coordenador
+        daily_profit = self._arrays["daily_profit"][:n_days].sum(axis=1)
+        daily_events = self._arrays["daily_events"][:n_days].sum(axis=1)
+        for k in range(n_days):
+            profit = float(daily_profit[k])
+            self.stats.add_daily_total(profit)
+            self.logs.append((self.day, profit, []))
+            self.daily_events.append(daily_events[k].copy())
+            self.day += 1
+        self._update_fail_counts()
+
+    def _update_fail_counts(self):
+        simple0, grave0, total0 = self._initial_fails
+        self.stats.simples = self.fleet.fail_count_simple - simple0
+        self.stats.grave = self.fleet.fail_count_grave - grave0
+        self.stats.total = self.fleet.fail_count_total - total0
+
+    def run(self, days=SIM_DAYS):
+        remaining = days
+        while remaining > 0:
+            n_days = min(self.block_days, remaining)
+            self._advance(n_days)
+            remaining -= n_days
+        self.sync_machines()
+
+    def sync_machines(self):
+        """Copia o estado compartilhado de volta para self.machines."""
+        self.fleet.to_machines(self.machines)
+
+    def report(self, filename_prefix="simulation"):
+        """Mesmo relatório do Simulator (usa logs, stats e day)."""
+        # Import tardio: os workers (spawn) reimportam este módulo e não precisam do simulador
+        from .simulator import Simulator
+        return Simulator.report(self, filename_prefix)
+
+    def close(self):
+        """Encerra os workers e libera a memória compartilhada."""
+        if not self._workers:
+            return
+        for proc, conn in self._workers:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for proc, conn in self._workers:
+            proc.join()
+            conn.close()
+        self._workers = []
+
+        # Os resultados continuam acessíveis depois de liberar a memória
+        self.stats.profit_total = self.stats.profit_total.copy()
+        self.fleet = FleetState.from_machines(self.machines)
+        self._arrays = {}
+        for shm in self._handles:
+            shm.close()
+            shm.unlink()
+        self._handles = []
@@ -1,154 +1,433 @@
 # src/sim/simulator.py
 
 import time
-import random
 import copy
-import torch
-from torch.utils.data import TensorDataset, DataLoader
+import random
+from bisect import bisect_right
+import numpy as np
 
 from .machine import create_random_machines
-from ..config import (
-    SIM_DAYS, SECONDS_PER_DAY, NUM_MACHINES,
-    DUR_SIMPLE, DUR_GRAVE, DUR_TOTAL,
-    BASE_FAIL_RATE, AGE_FAIL_FACTOR, MAX_FAIL_RATE,
-    COST_REPAIR_SIMPLE, COST_REPAIR_GRAVE, COST_REPAIR_TOTAL
+from .fleet import (
+    FleetState, EVENT_OPERANDO, EVENT_INDISPONIVEL,
+    EVENT_PARADA_PREVENTIVA, EVENT_FALHA_SIMPLES, EVENT_FALHA_GRAVE, EVENT_FALHA_TOTAL
 )
+from .rng import RandomStreams
+from .events import EventRecorder, DailyLog
+from .stats import StreamingStats
+from .training_buffer import TrainingBuffer
+from .profiling import NULL_PROFILER
+from . import checkpoint
+from ..config import SIM_DAYS, SECONDS_PER_DAY, NUM_MACHINES, DEFAULT_CONFIG
 from .logger import save_logs, plot_profit, plot_vpl_comparativo
-from src.genetic.genetic_algorithm import run_genetic
-from src.nn.rede_neural import model, train # Importa o modelo e a função de treino
+from src.genetic.genetic_algorithm import run_genetic, GeneticState
+from src.genetic.exact import run_exact
+from src.genetic.islands import run_islands
+
+# Motores de decisão diária (mesma interface de run_genetic)
+DECISION_ENGINES = {
+    "genetic": run_genetic,
+    "exact": run_exact,
+    "islands": run_islands,
+}
 
 class Simulator:
-    def __init__(self, machines, use_ai=False):
+    """
+    engine: "loop" (uma máquina por vez, objetos Machine) ou "vector"
+    (estado da frota em arrays NumPy, ver fleet.py), indicado para frotas
+    grandes.
+
+    Os eventos de cada dia ficam em self.events (EventRecorder, arrays
+    colunares). self.logs mantém o formato (dia, lucro, detalhes), mas os
+    detalhes só viram texto quando alguém os lê.
+
+    self.stats (StreamingStats) acumula lucro, VPL e contagens por máquina
+    durante a execução. history_days limita o histórico detalhado (events e
+    os detalhes de logs) aos últimos N dias; a série (dia, lucro) de logs
+    fica completa, então VPL e gráficos continuam contando desde o dia 0.
+    Com 0 a memória fica O(máquinas) mais dois números por dia.
+
+    model: MachinePredictor usado pela IA (padrão: o modelo global).
+
+    seed: semente dos fluxos aleatórios (self.streams). Toda a aleatoriedade
+    da simulação e do AG sai deles, então a mesma semente reproduz a
+    execução bit a bit, e políticas diferentes com a mesma semente
+    enfrentam as mesmas falhas subjacentes (números aleatórios comuns).
+
+    persistent_ga: mantém o AG entre dias (GeneticState): a população de
+    cada dia parte das melhores estratégias do anterior e para cedo
+    quando o melhor fitness estagna.
+
+    decision_engine: "genetic" (AG), "exact" (otimizador exato por máquina) ou
+    "islands" (AG em ilhas, uma por núcleo), ver DECISION_ENGINES; o padrão vem de config.decision_engine.
+
+    config: SimulationConfig (src/config.py) com taxas de falha, custos e
+    durações de reparo, parâmetros do AG e da decisão da RN. É repassado
+    ao motor de decisão e à RN. Padrão: DEFAULT_CONFIG (as constantes).
+
+    online_learner: OnlineLearner (src/nn/online.py). Com IA, cada dia
+    alimenta o buffer de replay com (features, falhou_hoje) e as decisões
+    usam sempre o modelo servido pelo learner, atualizado a cada K dias.
+
+    training_buffer: TrainingBuffer onde a coleta (sem IA, primeiro ano)
+    grava features e rótulos; passe um com path= para coletar direto em
+    disco. Padrão: buffer em memória.
+
+    log_sink: LogSink (logsink.py) que recebe cada dia durante a execução e
+    grava o log detalhado numa thread (com gzip/rotação opcionais). Com
+    ele, report() não reescreve o log no fim; feche o sink ao terminar.
+
+    profiler: Profiler (profiling.py) que mede cada fase do dia (decisão,
+    RN, avaliações do AG, atualização das máquinas, registro, I/O) e o
+    relatório. Padrão: desligado, sem custo relevante.
+
+    snapshot()/fork()/save_checkpoint()/load_checkpoint(): ver checkpoint.py.
+    Retomar ou bifurcar a partir de um snapshot continua a execução
+    exatamente como se ela não tivesse parado.
+    """
+    def __init__(self, machines, use_ai=False, engine="loop", seed=None, history_days=None,
+                 model=None, persistent_ga=False, decision_engine=None,
+                 online_learner=None, training_buffer=None, log_sink=None, profiler=None,
+                 config=None):
+        self.config = DEFAULT_CONFIG if config is None else config
+        decision_engine = self.config.decision_engine if decision_engine is None else decision_engine
+        if engine not in ("loop", "vector"):
+            raise ValueError(f"Motor de simulação desconhecido: {engine}")
+        if decision_engine not in DECISION_ENGINES:
+            raise ValueError(f"Motor de decisão desconhecido: {decision_engine}")
+        self.decide = DECISION_ENGINES[decision_engine]
+        self.decision_engine = decision_engine
         self.machines = machines
         self.use_ai = use_ai
+        self.model = model
+        self.engine = engine
         self.day = 0
-        self.logs = []
-        self.training_data = [] # Para coletar dados para a RN
+        self.logs = DailyLog(max_days=history_days)
+        self.events = EventRecorder(max_days=history_days)
+        self.stats = StreamingStats(len(machines))
+        self.streams = RandomStreams(seed)
+        self.ga_state = GeneticState() if persistent_ga else None
+        # Para coletar dados para a RN
+        self.training_data = TrainingBuffer() if training_buffer is None else training_buffer
+        self.online_learner = online_learner if use_ai else None
+        self.log_sink = log_sink
+        self.profiler = NULL_PROFILER if profiler is None else profiler
+
+        if engine == "vector":
+            self.fleet = FleetState.from_machines(machines)
+
+    def _decide(self, day_log):
+        seed = self.streams.seed_for("ga", self.day)
+        model = self.online_learner.model if self.online_learner is not None else self.model
+        with self.profiler.phase("decide"):
+            return self.decide(self.machines, day_log, self.day, seed=seed, model=model,
+                               state=self.ga_state, profiler=self.profiler, config=self.config)
+
+    def _learn_online(self, features, labels):
+        """Entrega as observações do dia ao aprendizado online (sem esperar o treino)."""
+        with self.profiler.phase("online_learning"):
+            self.online_learner.observe(features, labels)
+            self.online_learner.maybe_update(self.day)
 
     def simulate_day(self):
+        with self.profiler.phase("day"):
+            if self.engine == "vector":
+                self._simulate_day_vector()
+            else:
+                self._simulate_day_loop()
+
+    def _simulate_day_loop(self):
         daily_profit = 0
         day_log = []
+        day_ids, day_events, day_profits, day_downtime = [], [], [], []
+        config = self.config
         
         # Define a estratégia para o dia
         if self.use_ai and self.day >= 365:
-            best_strategy = run_genetic(self.machines, day_log, self.day)
+            best_strategy = self._decide(day_log)
         else:
             # Estratégia padrão: sempre operar (run-to-failure)
             best_strategy = type('Dummy', (object,), {'genes': {m.id: True for m in self.machines}})()
 
-        for m in self.machines:
-            m.current_day = self.day
-            day_profit_machine = 0
-            event = "n/a"
-            
-            # Coleta de features ANTES da ação do dia
-            features = [
-                m.age, m.last_fail_days, m.profit, m.cost, 
-                m.fail_count_simple, m.fail_count_grave + m.fail_count_total
-            ]
-            failed_today = 0
-
-            if m.unavailable_days > 0:
-                event = f"indisponível ({m.unavailable_days} dias restantes)"
-                m.unavailable_days -= 1
-            else:
-                operate_decision = best_strategy.genes[m.id]
+        with self.profiler.phase("update"):
+            uniforms = self.streams.day_uniforms(self.day, 0, len(self.machines)).tolist()
+            online_features, online_labels = [], []
+
+            for m, (u_fail, u_type) in zip(self.machines, uniforms):
+                m.current_day = self.day
+                day_profit_machine = 0
+                downtime = 0
+
+                # Coleta de features ANTES da ação do dia
+                features = [
+                    m.age, m.last_fail_days, m.profit, m.cost,
+                    m.fail_count_simple, m.fail_count_grave + m.fail_count_total
+                ]
+                failed_today = 0
+
+                if m.unavailable_days > 0:
+                    event = EVENT_INDISPONIVEL
+                    downtime = m.unavailable_days
+                    m.unavailable_days -= 1
+                else:
+                    operate_decision = best_strategy.genes[m.id]
                 
-                # A máquina só pode quebrar se a decisão for operar
-                if operate_decision:
-                    fail_chance = min(BASE_FAIL_RATE + m.age * AGE_FAIL_FACTOR, MAX_FAIL_RATE)
-                    if random.random() < fail_chance:
-                        failed_today = 1 # A máquina falhou
-                        fail_type = random.choices(["simples", "grave", "total"], weights=[0.6, 0.3, 0.1])[0]
-                        m.last_fail_days = 0
-                        m.age = 0
-                        if fail_type == "simples":
-                            day_profit_machine = -COST_REPAIR_SIMPLE
-                            m.unavailable_days = DUR_SIMPLE
-                            m.fail_count_simple += 1
-                            event = "falha_simples"
-                        elif fail_type == "grave":
-                            day_profit_machine = -COST_REPAIR_GRAVE
-                            m.unavailable_days = DUR_GRAVE
-                            m.fail_count_grave += 1
-                            event = "falha_grave"
-                        else: # total
-                            day_profit_machine = -COST_REPAIR_TOTAL
-                            m.unavailable_days = DUR_TOTAL
-                            m.fail_count_total += 1
-                            event = "falha_total"
+                    # A máquina só pode quebrar se a decisão for operar
+                    if operate_decision:
+                        fail_chance = config.fail_chance(m.age)
+                        if u_fail < fail_chance:
+                            failed_today = 1 # A máquina falhou
+                            # Pesos config.fail_type_weights, mesmo mapeamento do motor vetorizado
+                            fail_type = ["simples", "grave", "total"][bisect_right(config.fail_type_cum_weights, u_type)]
+                            m.last_fail_days = 0
+                            m.age = 0
+                            if fail_type == "simples":
+                                day_profit_machine = -config.cost_repair_simple
+                                m.unavailable_days = config.dur_simple
+                                m.fail_count_simple += 1
+                                event = EVENT_FALHA_SIMPLES
+                            elif fail_type == "grave":
+                                day_profit_machine = -config.cost_repair_grave
+                                m.unavailable_days = config.dur_grave
+                                m.fail_count_grave += 1
+                                event = EVENT_FALHA_GRAVE
+                            else: # total
+                                day_profit_machine = -config.cost_repair_total
+                                m.unavailable_days = config.dur_total
+                                m.fail_count_total += 1
+                                event = EVENT_FALHA_TOTAL
+                            downtime = m.unavailable_days
+                        else:
+                            # Operou normalmente sem falha
+                            day_profit_machine = m.profit - m.cost
+                            event = EVENT_OPERANDO
+                            m.age += 1
                     else:
-                        # Operou normalmente sem falha
-                        day_profit_machine = m.profit - m.cost
-                        event = "operando"
-                        m.age += 1
-                else:
-                    # CORRIGIDO: Lógica da parada preventiva
-                    day_profit_machine = -m.cost
-                    event = "parada_preventiva"
-                    m.age = 0 # Manutenção "rejuvenesce" a máquina
-            
-            # Atualiza contadores e logs
-            m.last_fail_days += 1
-            daily_profit += day_profit_machine
-            day_log.append(f"Máquina {m.id}: {event}, Lucro: {day_profit_machine:.2f}")
-
-            # Salva dados para treino apenas na fase de coleta
-            if not self.use_ai and self.day < 365:
-                self.training_data.append((features, [failed_today]))
-
-        self.logs.append((self.day, daily_profit, day_log))
+                        # CORRIGIDO: Lógica da parada preventiva
+                        day_profit_machine = -m.cost
+                        event = EVENT_PARADA_PREVENTIVA
+                        m.age = 0 # Manutenção "rejuvenesce" a máquina
+
+                # Atualiza contadores e eventos
+                m.last_fail_days += 1
+                daily_profit += day_profit_machine
+                day_ids.append(m.id)
+                day_events.append(event)
+                day_profits.append(day_profit_machine)
+                day_downtime.append(downtime)
+
+                # Salva dados para treino apenas na fase de coleta
+                if not self.use_ai and self.day < 365:
+                    self.training_data.append(features, failed_today)
+                elif self.online_learner is not None:
+                    online_features.append(features)
+                    online_labels.append(failed_today)
+
+        if self.online_learner is not None:
+            self._learn_online(online_features, online_labels)
+
+        self._record_day(daily_profit, day_ids, day_events, day_profits, day_downtime)
+
+    def _simulate_day_vector(self):
+        """Mesmo dia de simulate_day, mas avançando a frota inteira em lote."""
+        fleet = self.fleet
+        day_log = []
+
+        operate = None # None = todas operam (run-to-failure)
+        if self.use_ai and self.day >= 365:
+            # O AG ainda trabalha sobre objetos Machine
+            fleet.to_machines(self.machines)
+            best_strategy = self._decide(day_log)
+            operate = np.array([best_strategy.genes[mid] for mid in fleet.ids.tolist()], dtype=bool)
+
+        # Coleta de features ANTES da ação do dia
+        collect = not self.use_ai and self.day < 365
+        if collect or self.online_learner is not None:
+            features = fleet.features()
+
+        with self.profiler.phase("update"):
+            uniforms = self.streams.day_uniforms(self.day, 0, fleet.size)
+            profits, events, downtime, failed = fleet.step(operate, uniforms, self.config)
+            daily_profit = float(profits.sum())
+
+            if collect:
+                self.training_data.extend(features, failed)
+        if self.online_learner is not None:
+            self._learn_online(features, failed)
+
+        self._record_day(daily_profit, fleet.ids, events, profits, downtime)
+
+    def _record_day(self, daily_profit, ids, events, profits, downtime):
+        """Fecha o dia: estatísticas, eventos, logs e log em streaming."""
+        with self.profiler.phase("record"):
+            self.stats.update(profits, events)
+            details = self.events.record_day(self.day, ids, events, profits, downtime)
+            self.logs.append((self.day, daily_profit, details))
+        if self.log_sink is not None:
+            with self.profiler.phase("log_sink"):
+                self.log_sink.write_day(self.day, daily_profit, details)
         self.day += 1
 
+    def sync_machines(self):
+        """Copia o estado do motor vetorizado de volta para self.machines."""
+        if self.engine == "vector":
+            self.fleet.to_machines(self.machines)
+
     def run(self, days=SIM_DAYS):
-        for _ in range(days):
-            self.simulate_day()
-            # time.sleep(SECONDS_PER_DAY)
+        for _ in self.run_iter(days, chunk_days=days):
+            pass
+
+    def run_iter(self, days=SIM_DAYS, chunk_days=30):
+        """
+        Igual a run, mas como gerador: simula em blocos de chunk_days e
+        devolve o número de dias já simulados ao fim de cada bloco, para
+        quem quer mostrar resultados parciais (logs/stats já atualizados).
+        Se o gerador for fechado antes do fim (cancelamento), a simulação
+        para ali e o estado fica consistente.
+        """
+        end = self.day + days
+        try:
+            while self.day < end:
+                for _ in range(min(max(1, chunk_days), end - self.day)):
+                    self.simulate_day()
+                    # time.sleep(SECONDS_PER_DAY)
+                yield self.day
+        finally:
+            if self.online_learner is not None:
+                self.online_learner.wait()
+            self.training_data.flush()
+            self.sync_machines()
+            self.profiler.export()
+
+    def snapshot(self):
+        """Estado completo da simulação (dict independente deste objeto)."""
+        return checkpoint.snapshot(self)
+
+    def fork(self, **overrides):
+        """Cópia independente a partir do dia atual (cenários "e se" sem repetir o prefixo)."""
+        return checkpoint.restore(self.snapshot(), copy_state=False, **overrides)
+
+    def save_checkpoint(self, path):
+        return checkpoint.save_checkpoint(self, path)
+
+    @classmethod
+    def load_checkpoint(cls, path, **overrides):
+        """Retoma uma simulação gravada com save_checkpoint."""
+        return checkpoint.load_checkpoint(path, **overrides)
 
     def report(self, filename_prefix="simulation"):
-        total_profit = sum(p for _, p, _ in self.logs)
+        total_profit = self.stats.total_profit
         print(f"\n=== Relatório para '{filename_prefix}' ===")
         print(f"Lucro líquido total após {self.day} dias: ${total_profit:,.2f}")
-        save_logs(self.logs, f"output/{filename_prefix}_log.txt")
-        plot_profit(self.logs, filename=f"output/{filename_prefix}_profit.png")
+        if self.ga_state is not None and self.ga_state.generations_used:
+            used = self.ga_state.generations_used
+            print(f"AG persistente: média de {sum(used) / len(used):.1f} gerações por dia")
+        with self.profiler.phase("report"):
+            if self.log_sink is None:
+                with self.profiler.phase("save_logs"):
+                    save_logs(self.logs, f"output/{filename_prefix}_log.txt")
+            with self.profiler.phase("plot_profit"):
+                plot_profit(self.logs, filename=f"output/{filename_prefix}_profit.png")
         print(f"Gráficos e logs salvos na pasta 'output/' com o prefixo '{filename_prefix}'")
+        if self.profiler.export() is not None:
+            print(f"Métricas de desempenho salvas em '{self.profiler.export_prefix}_profile.txt'")
 
 
 # ==================== BLOCO DE EXECUÇÃO PRINCIPAL ====================
 if __name__ == "__main__":
-    initial_machines = create_random_machines()
-
-    # --- FASE 1: Coleta de Dados ---
-    print("--- FASE 1: Coletando dados por 365 dias (sem IA) ---")
-    data_collector = Simulator(machines=copy.deepcopy(initial_machines), use_ai=False)
-    data_collector.run(days=365)
-    print(f"{len(data_collector.training_data)} registros de dados coletados.")
-
-    # --- FASE 2: Treinamento da Rede Neural ---
-    print("\n--- FASE 2: Treinando a Rede Neural ---")
-    features_tensor = torch.tensor([item[0] for item in data_collector.training_data], dtype=torch.float32)
-    labels_tensor = torch.tensor([item[1] for item in data_collector.training_data], dtype=torch.float32)
-    
-    train_dataset = TensorDataset(features_tensor, labels_tensor)
-    train_loader = DataLoader(dataset=train_dataset, batch_size=64, shuffle=True)
-    
-    # A função train treina o 'model' global importado
-    train(model, train_loader, epochs=50)
+    import os
+    import argparse
+    import torch
+    from src.nn.rede_neural import MachinePredictor, train_fast
+    from src.nn.registry import ModelRegistry
+    from .logsink import LogSink
+    from .profiling import Profiler
+
+    parser = argparse.ArgumentParser(description="Simulação comparativa com/sem IA")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="semente: torna a execução reproduzível e reaproveita o modelo treinado em cache")
+    parser.add_argument("--stream-logs", action="store_true",
+                        help="grava o log detalhado durante a simulação, comprimido (gzip) e dividido por ano")
+    parser.add_argument("--checkpoint-every", type=int, default=None, metavar="DIAS",
+                        help="grava output/<prefixo>_checkpoint.pkl a cada DIAS dias da fase 3")
+    parser.add_argument("--resume", action="store_true",
+                        help="retoma a fase 3 dos checkpoints gravados (se existirem)")
+    parser.add_argument("--profile", action="store_true",
+                        help="mede o tempo de cada fase e salva output/<prefixo>_profile.json/.txt")
+    args = parser.parse_args()
+
+    def open_sink(prefix):
+        if not args.stream_logs:
+            return None
+        return LogSink(f"output/{prefix}_log.txt", compress=True, days_per_file=365)
+
+    def run_phase3(prefix, days, **options):
+        """Roda (ou retoma) uma simulação da fase 3, gravando checkpoints se pedido."""
+        path = f"output/{prefix}_checkpoint.pkl"
+        profiler = Profiler(args.profile, export_prefix=f"output/{prefix}")
+        if args.resume and os.path.exists(path):
+            sim = Simulator.load_checkpoint(path, profiler=profiler)
+            print(f"Retomando '{prefix}' do dia {sim.day} ({path})")
+            # Log em streaming só dos dias retomados, sem sobrescrever as partes anteriores
+            sim.log_sink = open_sink(f"{prefix}_from{sim.day}")
+        else:
+            sim = Simulator(log_sink=open_sink(prefix), profiler=profiler, **options)
+
+        if args.checkpoint_every:
+            for _ in sim.run_iter(days - sim.day, chunk_days=args.checkpoint_every):
+                sim.save_checkpoint(path)
+        else:
+            sim.run(days=days - sim.day)
+        if sim.log_sink is not None:
+            sim.log_sink.close()
+        sim.report(filename_prefix=prefix)
+        return sim
+
+    if args.seed is None:
+        initial_machines = create_random_machines()
+        collect_seed = None
+        # Mesma semente para as duas simulações comparativas: ambas enfrentam as mesmas falhas
+        sim_seed = np.random.SeedSequence()
+    else:
+        torch.manual_seed(args.seed)
+        initial_machines = create_random_machines(rng=random.Random(args.seed))
+        collect_seed, sim_seed = [args.seed, 0], [args.seed, 1]
+    # Criado depois de semear o torch: com --seed, os pesos iniciais também são reproduzíveis
+    model = MachinePredictor()
+
+    # Só há cache com semente: sem ela o cenário muda a cada execução
+    registry = ModelRegistry()
+    cache_key = registry.key(args.seed, DEFAULT_CONFIG, collect_days=365, epochs=50, trainer="train_fast")
+    cached = registry.load(cache_key, model) if args.seed is not None else None
+
+    if cached is not None:
+        print(f"--- FASES 1-2: Modelo treinado carregado do cache ({cache_key}) ---")
+    else:
+        # --- FASE 1: Coleta de Dados ---
+        print("--- FASE 1: Coletando dados por 365 dias (sem IA) ---")
+        data_collector = Simulator(machines=copy.deepcopy(initial_machines), use_ai=False, seed=collect_seed)
+        data_collector.run(days=365)
+        print(f"{len(data_collector.training_data)} registros de dados coletados.")
+
+        # --- FASE 2: Treinamento da Rede Neural ---
+        print("\n--- FASE 2: Treinando a Rede Neural ---")
+        features_tensor, labels_tensor = data_collector.training_data.to_tensors()
+
+        train_fast(model, features_tensor, labels_tensor, epochs=50, seed=args.seed)
+        if args.seed is not None:
+            registry.save(cache_key, model, features_tensor, labels_tensor, {"seed": args.seed})
 
     # --- FASE 3: Simulação Comparativa ---
     total_sim_days = 10 * 365 # Ex: 10 anos
     
     # Simulação COM IA (usando o modelo treinado)
     print(f"\n--- FASE 3.1: Rodando simulação COM IA por {total_sim_days} dias ---")
-    sim_ai = Simulator(machines=copy.deepcopy(initial_machines), use_ai=True)
-    sim_ai.run(days=total_sim_days)
-    sim_ai.report(filename_prefix="with_ai")
+    sim_ai = run_phase3("with_ai", total_sim_days, machines=copy.deepcopy(initial_machines),
+                        use_ai=True, seed=sim_seed, model=model)
 
     # Simulação SEM IA (run-to-failure)
     print(f"\n--- FASE 3.2: Rodando simulação SEM IA por {total_sim_days} dias ---")
-    sim_no_ai = Simulator(machines=copy.deepcopy(initial_machines), use_ai=False)
-    sim_no_ai.run(days=total_sim_days)
-    sim_no_ai.report(filename_prefix="without_ai")
+    sim_no_ai = run_phase3("without_ai", total_sim_days, machines=copy.deepcopy(initial_machines),
+                           use_ai=False, seed=sim_seed)
 
     # --- FASE 4: Relatório Final Comparativo ---
     print("\n--- FASE 4: Gerando relatório comparativo ---")
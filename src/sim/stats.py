@@ -0,0 +1,58 @@
+# src/sim/stats.py
+
+import numpy as np
+
+from .fleet import (
+    EVENT_PARADA_PREVENTIVA, EVENT_FALHA_SIMPLES, EVENT_FALHA_GRAVE, EVENT_FALHA_TOTAL
+)
+
+
+class StreamingStats:
+    """
+    Agregados incrementais da simulação, atualizados dia a dia:
+    lucro e contagens de falhas/paradas por máquina, lucro acumulado e
+    VPL descontado. Memória O(máquinas), independente do horizonte.
+    """
+    def __init__(self, num_machines, discount_rate=0.08):
+        self.discount_rate = discount_rate
+        self.days = 0
+        self.total_profit = 0.0
+        self.vpl = 0.0
+
+        self.profit_total = np.zeros(num_machines, dtype=np.float64)
+        self.simples = np.zeros(num_machines, dtype=np.int64)
+        self.grave = np.zeros(num_machines, dtype=np.int64)
+        self.total = np.zeros(num_machines, dtype=np.int64)
+        self.preventiva = np.zeros(num_machines, dtype=np.int64)
+
+    def update(self, profits, events):
+        """Acumula um dia. profits/events: arrays na ordem das máquinas do simulador."""
+        profits = np.asarray(profits, dtype=np.float64)
+        events = np.asarray(events)
+        daily_profit = self.add_daily_total(float(profits.sum()))
+
+        self.profit_total += profits
+        self.simples += events == EVENT_FALHA_SIMPLES
+        self.grave += events == EVENT_FALHA_GRAVE
+        self.total += events == EVENT_FALHA_TOTAL
+        self.preventiva += events == EVENT_PARADA_PREVENTIVA
+        return daily_profit
+
+    def add_daily_total(self, daily_profit):
+        """Acumula só o lucro agregado de um dia (lucro total e VPL)."""
+        self.days += 1
+        self.total_profit += daily_profit
+        # Mesmo desconto de calculate_vpl: o primeiro dia registrado é t = 1
+        self.vpl += daily_profit / ((1 + self.discount_rate) ** (self.days / 365))
+        return daily_profit
+
+    def machine_summary(self, num_machines=None):
+        """Mesmo formato de EventRecorder.machine_summary."""
+        n = len(self.profit_total) if num_machines is None else num_machines
+        return {
+            "profit_total": self.profit_total[:n],
+            "simples": self.simples[:n],
+            "grave": self.grave[:n],
+            "total": self.total[:n],
+            "preventiva": self.preventiva[:n],
+        }
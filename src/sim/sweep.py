@@ -0,0 +1,277 @@
+# src/sim/sweep.py
+
+import os
+import csv
+import copy
+import time
+import random
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .machine import create_random_machines
+from .replication import COLLECT_DAYS, TRAIN_EPOCHS, train_predictor, _init_worker
+from ..config import DEFAULT_CONFIG, SimulationConfig
+
+SWEEP_OUTPUT = "output/sweep.csv"
+# Como a varredura coleta e treina (motor da coleta e derivação das sementes). Entra na
+# chave do registro: o modelo difere do da CLI/app (coleta "loop", sementes [seed, 0] e seed)
+SWEEP_PIPELINE = {"pipeline": "sweep", "collect_engine": "vector", "seeds": "SeedSequence(seed).spawn(4)"}
+METRICS = ("profit_ai", "profit_no_ai", "profit_diff", "vpl_ai", "vpl_no_ai", "vpl_diff")
+
+
+# ==================== Geração de Configurações ====================
+def _check_fields(names):
+    unknown = set(names) - set(SimulationConfig.field_names())
+    if unknown:
+        raise ValueError(f"Campos desconhecidos em SimulationConfig: {', '.join(sorted(unknown))}")
+
+
+def grid(base=DEFAULT_CONFIG, **axes):
+    """
+    Todas as combinações dos valores de cada eixo, a partir de `base`:
+    grid(base_fail_rate=[0.005, 0.01], cost_repair_grave=[4000, 8000]) -> 4 configs.
+    """
+    _check_fields(axes)
+    names = list(axes)
+    return [base.replace(**dict(zip(names, values)))
+            for values in itertools.product(*(axes[name] for name in names))]
+
+
+def random_configs(n, base=DEFAULT_CONFIG, seed=0, **ranges):
+    """
+    n configs sorteadas a partir de `base`. Cada campo recebe (mín, máx),
+    sorteado uniformemente (inteiro se o campo for inteiro), ou uma lista
+    de valores, sorteada entre eles.
+    """
+    _check_fields(ranges)
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(n):
+        changes = {}
+        for name, spec in ranges.items():
+            if isinstance(spec, list):
+                changes[name] = spec[int(rng.integers(len(spec)))]
+            elif isinstance(getattr(base, name), int):
+                changes[name] = int(rng.integers(spec[0], spec[1] + 1))
+            else:
+                changes[name] = float(rng.uniform(spec[0], spec[1]))
+        configs.append(base.replace(**changes))
+    return configs
+
+
+# ==================== Pipeline de Um Ponto ====================
+def _seeds(seed):
+    """
+    Mesmas sementes de run_replication (números aleatórios comuns entre as
+    políticas): (coleta, simulação, treino).
+    """
+    collect_seed, ai_seed, _, train_seed = np.random.SeedSequence(seed).spawn(4)
+    return collect_seed, ai_seed, int(train_seed.generate_state(1)[0])
+
+
+def _machines(config, seed):
+    return create_random_machines(rng=random.Random(seed), config=config)
+
+
+def model_cache_key(registry, config, seed, epochs):
+    """
+    Chave do modelo no ModelRegistry: os campos de config que afetam o treino
+    (model_key) e o pipeline da varredura, que não compartilha entradas com a CLI/app.
+    """
+    return registry.key(seed, config, collect_days=COLLECT_DAYS, epochs=epochs, trainer="train_fast",
+                        **SWEEP_PIPELINE)
+
+
+def train_model(config, seed, epochs, registry_root):
+    """
+    Coleta (sem IA) e treina o modelo do cenário, a menos que o registro já
+    o tenha. Retorna (chave, já_estava_no_cache).
+    """
+    import torch
+    from src.nn.registry import ModelRegistry
+    from .simulator import Simulator
+
+    registry = ModelRegistry(registry_root)
+    key = model_cache_key(registry, config, seed, epochs)
+    if registry.load(key) is not None:
+        return key, True
+
+    torch.manual_seed(seed)
+    collect_seed, _, train_seed = _seeds(seed)
+    collector = Simulator(_machines(config, seed), engine="vector", seed=collect_seed,
+                          history_days=0, config=config)
+    collector.run(days=COLLECT_DAYS)
+    predictor = train_predictor(collector.training_data, epochs=epochs, seed=train_seed)
+    features, labels = collector.training_data.to_tensors()
+    registry.save(key, predictor, features, labels, dict(config.model_key(), seed=seed))
+    return key, False
+
+
+def run_point(config, seed, days, engine, model_key, registry_root, epochs=TRAIN_EPOCHS):
+    """
+    Compara com/sem IA num cenário, com o modelo já treinado no registro.
+    Se a entrada sumiu do registro (cache apagado no meio da varredura),
+    treina de novo com train_model.
+    """
+    from src.nn.registry import ModelRegistry
+    from .simulator import Simulator
+
+    start = time.perf_counter()
+    registry = ModelRegistry(registry_root)
+    entry = registry.load(model_key)
+    if entry is None:
+        key, _ = train_model(config, seed, epochs, registry_root)
+        entry = registry.load(key) if key == model_key else None
+        if entry is None:
+            raise RuntimeError(f"Modelo '{model_key}' não encontrado em '{registry.root}' "
+                               f"e não foi possível treiná-lo de novo")
+    predictor, _, _, _ = entry
+    _, ai_seed, _ = _seeds(seed)
+    machines = _machines(config, seed)
+
+    sim_ai = Simulator(copy.deepcopy(machines), use_ai=True, engine=engine, seed=ai_seed,
+                       history_days=0, model=predictor, config=config)
+    sim_ai.run(days=days)
+    sim_no_ai = Simulator(copy.deepcopy(machines), use_ai=False, engine=engine, seed=ai_seed,
+                          history_days=0, config=config)
+    sim_no_ai.run(days=days)
+
+    return {
+        "profit_ai": sim_ai.stats.total_profit,
+        "profit_no_ai": sim_no_ai.stats.total_profit,
+        "profit_diff": sim_ai.stats.total_profit - sim_no_ai.stats.total_profit,
+        "vpl_ai": sim_ai.stats.vpl,
+        "vpl_no_ai": sim_no_ai.stats.vpl,
+        "vpl_diff": sim_ai.stats.vpl - sim_no_ai.stats.vpl,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+# ==================== Varredura Paralela ====================
+def run_sweep(configs, days, replications=1, base_seed=0, engine="vector", epochs=TRAIN_EPOCHS,
+              max_workers=None, output=SWEEP_OUTPUT, registry_root=None):
+    """
+    Roda cada config (com as sementes base_seed, base_seed + 1, ...) num
+    pool de processos e grava uma tabela CSV com uma linha por
+    (config, semente): todos os campos da config e as métricas de METRICS.
+
+    Em duas etapas: primeiro treina um modelo por combinação distinta de
+    (config.model_key(), semente), guardado no ModelRegistry (e reaproveitado
+    de execuções anteriores); depois roda as comparações, que só carregam o
+    modelo. Configs que diferem só em custos, parâmetros do AG ou da decisão
+    compartilham o mesmo modelo.
+    Retorna a lista de linhas (dicts) na ordem de configs.
+    """
+    from src.nn.registry import ModelRegistry, MODEL_CACHE_DIR
+
+    registry_root = MODEL_CACHE_DIR if registry_root is None else registry_root
+    max_workers = max_workers or os.cpu_count() or 1
+    points = [(i, config, base_seed + r) for i, config in enumerate(configs) for r in range(replications)]
+
+    # Um treino por modelo distinto
+    registry = ModelRegistry(registry_root)
+    to_train = {}
+    for _, config, seed in points:
+        to_train.setdefault(model_cache_key(registry, config, seed, epochs), (config, seed))
+
+    rows = [None] * len(points)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+        cached = {}
+        futures = [pool.submit(train_model, config, seed, epochs, registry_root)
+                   for config, seed in to_train.values()]
+        for future in as_completed(futures):
+            key, was_cached = future.result()
+            cached[key] = was_cached
+        print(f"Modelos: {len(cached)} distintos para {len(points)} pontos "
+              f"({sum(cached.values())} já estavam no cache)")
+
+        futures = {}
+        for n, (i, config, seed) in enumerate(points):
+            key = model_cache_key(registry, config, seed, epochs)
+            future = pool.submit(run_point, config, seed, days, engine, key, registry_root, epochs)
+            futures[future] = (n, i, config, seed, key)
+        for done, future in enumerate(as_completed(futures), 1):
+            n, i, config, seed, key = futures[future]
+            rows[n] = dict(config=i, seed=seed, **config.to_dict(), model=key,
+                           model_cached=cached[key], **future.result())
+            print(f"[{done}/{len(points)}] config {i} semente {seed}: "
+                  f"diferença de VPL R$ {rows[n]['vpl_diff']:,.2f}")
+
+    if output:
+        write_table(rows, output)
+    return rows
+
+
+def write_table(rows, path):
+    """Grava as linhas da varredura num CSV (faixas como 'mín-máx')."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({k: "-".join(map(str, v)) if isinstance(v, tuple) else v
+                             for k, v in row.items()})
+    return path
+
+
+# ==================== BLOCO DE EXECUÇÃO PRINCIPAL ====================
+def _parse_value(name, text):
+    default = getattr(DEFAULT_CONFIG, name)
+    if isinstance(default, tuple): # Faixas (inteiros) ou pesos dos tipos de falha (floats)
+        return tuple(type(d)(v) for d, v in zip(default, text.split(":")))
+    return type(default)(text)
+
+
+def _parse_axes(items, parser):
+    """['campo=v1,v2', ...] -> {campo: [v1, v2]}."""
+    axes = {}
+    for item in items or ():
+        name, _, values = item.partition("=")
+        if name not in SimulationConfig.field_names() or not values:
+            parser.error(f"eixo inválido: {item}")
+        axes[name] = [_parse_value(name, v) for v in values.split(",")]
+    return axes
+
+
+def _parse_ranges(items, parser):
+    """['campo=mín:máx', ...] -> {campo: (mín, máx)}."""
+    ranges = {}
+    for item in items or ():
+        name, _, bounds = item.partition("=")
+        if name not in SimulationConfig.field_names() or bounds.count(":") != 1:
+            parser.error(f"faixa inválida: {item}")
+        low, high = bounds.split(":")
+        ranges[name] = (_parse_value(name, low), _parse_value(name, high))
+    return ranges
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Varredura de parâmetros da comparação com/sem IA")
+    parser.add_argument("--grid", nargs="*", metavar="CAMPO=V1,V2",
+                        help="eixos da grade (todas as combinações)")
+    parser.add_argument("--random", type=int, default=None, metavar="N",
+                        help="sorteia N configs nas faixas de --range em vez da grade")
+    parser.add_argument("--range", nargs="*", metavar="CAMPO=MÍN:MÁX", help="faixas do sorteio")
+    parser.add_argument("--days", type=int, default=2 * 365, help="dias de cada simulação comparativa")
+    parser.add_argument("--replications", type=int, default=1, help="sementes por config")
+    parser.add_argument("--seed", type=int, default=0, help="primeira semente (e semente do sorteio)")
+    parser.add_argument("--engine", choices=("loop", "vector"), default="vector")
+    parser.add_argument("--epochs", type=int, default=TRAIN_EPOCHS)
+    parser.add_argument("--workers", type=int, default=None, help="processos (padrão: todos os núcleos)")
+    parser.add_argument("--out", default=SWEEP_OUTPUT, help="CSV de resultados")
+    args = parser.parse_args()
+
+    if args.random is not None:
+        configs = random_configs(args.random, seed=args.seed, **_parse_ranges(args.range, parser))
+    else:
+        configs = grid(**_parse_axes(args.grid, parser))
+
+    start = time.perf_counter()
+    run_sweep(configs, args.days, replications=args.replications, base_seed=args.seed,
+              engine=args.engine, epochs=args.epochs, max_workers=args.workers, output=args.out)
+    print(f"{len(configs)} configs em {time.perf_counter() - start:.1f}s; resultados em '{args.out}'")
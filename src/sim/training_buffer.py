@@ -0,0 +1,131 @@
+# src/sim/training_buffer.py
+
+import os
+import json
+
+import numpy as np
+
+N_FEATURES = 6 # Mesma ordem de rede_neural.FEATURE_NAMES
+INITIAL_CAPACITY = 4096
+
+
+class TrainingBuffer:
+    """
+    Dados de treino da RN em arrays NumPy pré-alocados: features (n x 6)
+    e rótulos (n x 1), ambos float32, prontos para torch.from_numpy sem
+    cópia. A capacidade dobra quando enche.
+
+    path: diretório opcional. Com ele, os arrays são memmaps de arquivos
+    .npy (features.npy, labels.npy) e o número de linhas válidas fica em
+    meta.json: dá para coletar datasets maiores que a RAM, persistir e
+    reabrir depois com TrainingBuffer.open(path).
+
+    Iterar ou indexar devolve tuplas (features, [rótulo]), o formato da
+    antiga lista Simulator.training_data.
+    """
+    def __init__(self, capacity=INITIAL_CAPACITY, path=None, n_features=N_FEATURES):
+        self.path = path
+        self._size = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        self._features = self._allocate("features", (max(1, capacity), n_features))
+        self._labels = self._allocate("labels", (max(1, capacity), 1))
+
+    @classmethod
+    def open(cls, path, mode="r+"):
+        """Reabre um buffer persistido em `path` (mode="r" para só leitura)."""
+        buffer = cls.__new__(cls)
+        buffer.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            buffer._size = json.load(f)["size"]
+        buffer._features = np.load(os.path.join(path, "features.npy"), mmap_mode=mode)
+        buffer._labels = np.load(os.path.join(path, "labels.npy"), mmap_mode=mode)
+        return buffer
+
+    def _allocate(self, name, shape, suffix=""):
+        if self.path is None:
+            return np.zeros(shape, dtype=np.float32)
+        filename = os.path.join(self.path, f"{name}.npy{suffix}")
+        return np.lib.format.open_memmap(filename, mode="w+", dtype=np.float32, shape=shape)
+
+    def _grow(self, name, old, capacity):
+        if self.path is None:
+            new = np.zeros((capacity, old.shape[1]), dtype=np.float32)
+            new[:self._size] = old[:self._size]
+            return new
+        # Memmap: copia para um arquivo maior e troca no lugar do antigo
+        new = self._allocate(name, (capacity, old.shape[1]), suffix=".tmp")
+        new[:self._size] = old[:self._size]
+        new.flush()
+        del new
+        final = os.path.join(self.path, f"{name}.npy")
+        os.replace(f"{final}.tmp", final)
+        return np.load(final, mmap_mode="r+")
+
+    def _reserve(self, n):
+        needed = self._size + n
+        capacity = len(self._features)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._features = self._grow("features", self._features, capacity)
+        self._labels = self._grow("labels", self._labels, capacity)
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, index):
+        if not -self._size <= index < self._size:
+            raise IndexError(index)
+        index %= self._size
+        return self._features[index].tolist(), self._labels[index].tolist()
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self._features[index].tolist(), self._labels[index].tolist()
+
+    @property
+    def capacity(self):
+        return len(self._features)
+
+    @property
+    def features(self):
+        """View (n x 6) das linhas válidas."""
+        return self._features[:self._size]
+
+    @property
+    def labels(self):
+        """View (n x 1) dos rótulos válidos."""
+        return self._labels[:self._size]
+
+    def append(self, features, label):
+        """Adiciona uma linha (features de uma máquina e se ela falhou)."""
+        self._reserve(1)
+        self._features[self._size] = features
+        self._labels[self._size, 0] = label
+        self._size += 1
+
+    def extend(self, features, labels):
+        """Adiciona várias linhas de uma vez: features (n x 6), labels (n,) ou (n x 1)."""
+        features = np.asarray(features, dtype=np.float32)
+        labels = np.asarray(labels, dtype=np.float32).reshape(-1)
+        n = len(features)
+        self._reserve(n)
+        self._features[self._size:self._size + n] = features
+        self._labels[self._size:self._size + n, 0] = labels
+        self._size += n
+
+    def to_tensors(self):
+        """(features, rótulos) como tensores float32 que compartilham a memória do buffer."""
+        import torch # Import tardio: coletar dados não exige torch
+        return torch.from_numpy(self.features), torch.from_numpy(self.labels)
+
+    def flush(self):
+        """Grava os memmaps e o tamanho atual em disco (sem efeito em memória)."""
+        if self.path is None:
+            return
+        self._features.flush()
+        self._labels.flush()
+        with open(os.path.join(self.path, "meta.json"), "w") as f:
+            json.dump({"size": self._size, "n_features": self._features.shape[1]}, f)
@@ -0,0 +1,17 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# Permite rodar `pytest` de qualquer diretório (os módulos são importados como src.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def model():
+    """MachinePredictor com pesos iniciais fixos (não treinado)."""
+    import torch
+    from src.nn.rede_neural import MachinePredictor
+    torch.manual_seed(7)
+    return MachinePredictor()
@@ -0,0 +1,47 @@
+# tests/test_checkpoint.py
+
+import random
+
+import pytest
+
+from src.config import SimulationConfig
+from src.sim.machine import create_random_machines
+from src.sim.simulator import Simulator
+
+
+def _simulator(engine, config=None):
+    machines = create_random_machines(rng=random.Random(7), config=config or SimulationConfig())
+    return Simulator(machines, engine=engine, seed=7, history_days=0, config=config)
+
+
+def _state(sim):
+    return [(m.age, m.unavailable_days, m.last_fail_days) for m in sim.machines]
+
+
+@pytest.mark.parametrize("engine", ["loop", "vector"])
+def test_checkpoint_resume_is_bit_exact(engine, tmp_path):
+    straight = _simulator(engine)
+    straight.run(120)
+
+    first = _simulator(engine)
+    first.run(50)
+    path = first.save_checkpoint(str(tmp_path / "sim.ckpt"))
+    resumed = Simulator.load_checkpoint(path)
+    resumed.run(70)
+
+    assert resumed.day == straight.day
+    assert [p for _, p, _ in resumed.logs] == [p for _, p, _ in straight.logs]
+    assert resumed.stats.total_profit == straight.stats.total_profit
+    assert _state(resumed) == _state(straight)
+
+
+def test_fork_continues_like_the_original():
+    config = SimulationConfig(max_fail_rate=0.1, dur_total=10)
+    sim = _simulator("vector", config)
+    sim.run(50)
+    fork = sim.fork()
+    fork.run(50)
+    sim.run(50)
+    assert fork.config == config
+    assert fork.stats.total_profit == sim.stats.total_profit
+    assert _state(fork) == _state(sim)
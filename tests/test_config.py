@@ -0,0 +1,25 @@
+# tests/test_config.py
+
+import random
+
+import pytest
+
+from src.config import DEFAULT_CONFIG
+from src.sim.machine import create_random_machines
+from src.sim.simulator import Simulator
+
+
+def test_avg_repair_cost_uses_fail_type_weights():
+    config = DEFAULT_CONFIG.replace(fail_type_weights=(0.0, 0.0, 1.0))
+    assert config.avg_repair_cost == config.cost_repair_total
+    assert DEFAULT_CONFIG.avg_repair_cost == pytest.approx(0.6 * 2000 + 0.3 * 8000 + 0.1 * 25000)
+
+
+@pytest.mark.parametrize("engine", ["loop", "vector"])
+def test_fail_type_weights_drive_the_simulation(engine):
+    config = DEFAULT_CONFIG.replace(fail_type_weights=(0.0, 0.0, 1.0))
+    sim = Simulator(create_random_machines(rng=random.Random(1), config=config), engine=engine,
+                    seed=1, config=config)
+    sim.run(365)
+    assert sim.stats.total.sum() > 0
+    assert sim.stats.simples.sum() == sim.stats.grave.sum() == 0
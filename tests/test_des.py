@@ -0,0 +1,48 @@
+# tests/test_des.py
+
+import copy
+import random
+
+import numpy as np
+
+from src.config import SimulationConfig
+from src.sim.des import EventDrivenSimulator
+from src.sim.machine import create_random_machines
+from src.sim.simulator import Simulator
+
+
+def test_event_driven_matches_vector_in_distribution():
+    config = SimulationConfig(age_fail_factor=0.002, dur_total=3)
+    days, seeds = 1000, range(20)
+    vector, des = [], []
+    for seed in seeds:
+        machines = create_random_machines(rng=random.Random(seed), config=config)
+        sim = Simulator(copy.deepcopy(machines), engine="vector", seed=seed, config=config)
+        sim.run(days)
+        event_driven = EventDrivenSimulator(copy.deepcopy(machines), seed=seed, config=config)
+        event_driven.run(days)
+        vector.append(sim.stats.total_profit / days)
+        des.append(event_driven.stats.total_profit / days)
+
+    vector, des = np.array(vector), np.array(des)
+    stderr = np.sqrt(vector.var(ddof=1) / len(vector) + des.var(ddof=1) / len(des))
+    assert abs(vector.mean() - des.mean()) < 4 * stderr
+
+
+def test_event_driven_is_chunk_invariant():
+    machines = create_random_machines(rng=random.Random(7))
+    whole = EventDrivenSimulator(copy.deepcopy(machines), seed=7)
+    whole.run(500)
+    chunked = EventDrivenSimulator(copy.deepcopy(machines), seed=7)
+    for days in (1, 99, 0, 250, 150):
+        chunked.run(days)
+    assert [p for _, p, _ in chunked.logs] == [p for _, p, _ in whole.logs]
+    assert np.array_equal(chunked.stats.profit_total, whole.stats.profit_total)
+
+
+def test_event_driven_bookkeeping_is_consistent():
+    sim = EventDrivenSimulator(create_random_machines(rng=random.Random(3)), seed=3)
+    sim.run(730)
+    assert np.isclose(sim.stats.profit_total.sum(), sim.stats.total_profit)
+    # Toda máquina está em exatamente um estado por dia
+    assert (np.array(sim.daily_events).sum(axis=1) == len(sim.machines)).all()
@@ -0,0 +1,39 @@
+# tests/test_fleet.py
+
+import random
+
+import pytest
+
+from src.config import DEFAULT_CONFIG, SimulationConfig
+from src.sim.machine import create_random_machines
+from src.sim.simulator import Simulator
+
+
+def _machines(config=DEFAULT_CONFIG):
+    return create_random_machines(rng=random.Random(7), config=config)
+
+
+def _profits(logs):
+    return [profit for _, profit, _ in logs]
+
+
+@pytest.mark.parametrize("config", [DEFAULT_CONFIG, SimulationConfig(max_fail_rate=0.1, dur_total=10)])
+def test_loop_and_vector_engines_match(config):
+    results = []
+    for engine in ("loop", "vector"):
+        sim = Simulator(_machines(config), engine=engine, seed=7, config=config)
+        sim.run(200)
+        results.append((_profits(sim.logs), [(m.age, m.unavailable_days) for m in sim.machines]))
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize("decision_engine", ["genetic", "exact"])
+def test_loop_and_vector_engines_match_with_ai(model, decision_engine):
+    profits = []
+    for engine in ("loop", "vector"):
+        sim = Simulator(_machines(), use_ai=True, engine=engine, seed=7, model=model,
+                        decision_engine=decision_engine)
+        sim.day = 365
+        sim.run(3)
+        profits.append(_profits(sim.logs))
+    assert profits[0] == profits[1]
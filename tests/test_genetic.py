@@ -0,0 +1,49 @@
+# tests/test_genetic.py
+
+import random
+
+import numpy as np
+
+from src.config import DEFAULT_CONFIG
+from src.genetic.genetic_algorithm import Strategy, evaluate, evaluate_population
+from src.sim.machine import create_random_machines
+
+
+def _fleet(n=10, seed=3):
+    machines = create_random_machines(n, rng=random.Random(seed))
+    for i, m in enumerate(machines):
+        m.age = (i * 37) % 400
+    return machines
+
+
+def test_batched_and_scalar_fitness_agree_in_distribution():
+    # Mesmo modelo de custo, sorteios diferentes: as médias de muitas avaliações coincidem
+    machines = _fleet()
+    rn_predictions = {m.id: m.id % 3 == 0 for m in machines}
+    strategy = Strategy({m.id: m.id % 2 == 0 for m in machines})
+    config = DEFAULT_CONFIG.replace(num_eval_simulations=20)
+
+    rng = random.Random(0)
+    scalar = []
+    for _ in range(300):
+        evaluate(strategy, machines, rn_predictions, rng, config)
+        scalar.append(strategy.fitness)
+    population = [Strategy(dict(strategy.genes)) for _ in range(300)]
+    batched = evaluate_population(population, machines, rn_predictions, np.random.default_rng(0), config)
+
+    scalar, batched = np.array(scalar), np.asarray(batched)
+    stderr = np.sqrt(scalar.var(ddof=1) / len(scalar) + batched.var(ddof=1) / len(batched))
+    assert abs(scalar.mean() - batched.mean()) < 4 * stderr
+    assert 0.7 < batched.std() / scalar.std() < 1.3
+
+
+def test_deterministic_part_is_identical():
+    # Sem falhas a avaliação não tem ruído: os dois caminhos dão o mesmo número
+    config = DEFAULT_CONFIG.replace(base_fail_rate=0.0, age_fail_factor=0.0)
+    machines = _fleet()
+    rn_predictions = {m.id: m.id % 3 == 0 for m in machines}
+    population = [Strategy(n_machines=len(machines), rng=random.Random(i)) for i in range(8)]
+    batched = evaluate_population(population, machines, rn_predictions, np.random.default_rng(0), config)
+    for strategy, value in zip(population, batched):
+        evaluate(strategy, machines, rn_predictions, random.Random(0), config)
+        assert strategy.fitness == value
@@ -0,0 +1,50 @@
+# tests/test_islands.py
+
+import random
+
+import numpy as np
+import pytest
+
+from src.config import DEFAULT_CONFIG
+from src.genetic.genetic_algorithm import GeneticState, fleet_arrays, population_fitness
+from src.genetic.islands import evolve_island, run_islands, shutdown_pool
+from src.sim.machine import create_random_machines
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _pool():
+    yield
+    shutdown_pool()
+
+
+def _fleet(n=20, seed=2):
+    machines = create_random_machines(n, rng=random.Random(seed))
+    for i, m in enumerate(machines):
+        m.age = (i * 37) % 400
+    return machines
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_parallel_and_sequential_islands_match(model, persistent):
+    machines = _fleet()
+    results = []
+    for parallel in (True, False):
+        state = GeneticState() if persistent else None
+        best = run_islands(machines, [], 400, seed=7, model=model, state=state, n_islands=2,
+                           parallel=parallel)
+        results.append((best.genes, best.fitness, state.generations_used if state else None))
+    assert results[0] == results[1]
+
+
+def test_common_draws_make_island_fitness_comparable():
+    # Com eval_seed, o fitness devolvido é o da reavaliação com os mesmos sorteios
+    machines = _fleet()
+    arrays = fleet_arrays(machines, {m.id: False for m in machines})
+    genes = np.random.default_rng(0).random((DEFAULT_CONFIG.population_size, len(machines))) < 0.5
+    genes, fitness = evolve_island(genes, arrays, 5, seed=1, eval_seed=123)
+
+    again = population_fitness(genes, *arrays, np.random.default_rng(123), DEFAULT_CONFIG, common_draws=True)
+    reversed_rows = population_fitness(genes[::-1], *arrays, np.random.default_rng(123), DEFAULT_CONFIG,
+                                       common_draws=True)
+    assert np.array_equal(fitness, again)
+    assert np.array_equal(fitness, reversed_rows[::-1])
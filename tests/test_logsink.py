@@ -0,0 +1,61 @@
+# tests/test_logsink.py
+
+import gzip
+import os
+
+import pytest
+
+from src.sim.logger import save_logs
+from src.sim.logsink import LogSink, format_day
+
+
+def _days(n, lines=3):
+    return [(day, float(day * 10), [f"Máquina {i}: operando, Lucro: {day}.00" for i in range(lines)])
+            for day in range(n)]
+
+
+def _read(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        return f.read().decode("utf-8")
+
+
+def test_single_file_matches_save_logs(tmp_path):
+    days = _days(50)
+    with LogSink(str(tmp_path / "log.txt")) as sink:
+        for day in days:
+            sink.write_day(*day)
+    save_logs(days, str(tmp_path / "expected.txt"))
+    assert sink.files == [str(tmp_path / "log.txt")]
+    assert _read(sink.files[0]) == _read(str(tmp_path / "expected.txt"))
+
+
+def test_rotation_by_days(tmp_path):
+    days = _days(100)
+    with LogSink(str(tmp_path / "log.txt"), compress=True, days_per_file=30) as sink:
+        for day in days:
+            sink.write_day(*day)
+    assert [os.path.basename(f) for f in sink.files] == [f"log.{i:04d}.txt.gz" for i in range(4)]
+    parts = [_read(f) for f in sink.files]
+    assert parts[0] == "".join(format_day(*day) for day in days[:30])
+    assert parts[3] == "".join(format_day(*day) for day in days[90:])
+
+
+def test_rotation_by_size(tmp_path):
+    days = _days(200)
+    day_bytes = len(format_day(*days[0]).encode("utf-8"))
+    max_bytes = 10 * day_bytes
+    with LogSink(str(tmp_path / "log.txt"), max_bytes=max_bytes) as sink:
+        for day in days:
+            sink.write_day(*day)
+    assert len(sink.files) > 1
+    # Cada parte passa do limite em no máximo um dia; nada se perde
+    assert all(os.path.getsize(f) < max_bytes + 2 * day_bytes for f in sink.files)
+    assert "".join(_read(f) for f in sink.files) == "".join(format_day(*day) for day in days)
+
+
+def test_write_after_close_fails(tmp_path):
+    sink = LogSink(str(tmp_path / "log.txt"))
+    sink.close()
+    with pytest.raises(ValueError):
+        sink.write_day(0, 0.0, [])
@@ -0,0 +1,66 @@
+# tests/test_registry.py
+
+import os
+
+import torch
+
+from src.nn.rede_neural import MachinePredictor
+from src.nn.registry import ModelRegistry
+
+
+def _save(registry, key, seed=0):
+    torch.manual_seed(seed)
+    model = MachinePredictor()
+    features, labels = torch.rand(20, 6), torch.randint(0, 2, (20, 1)).float()
+    return model, registry.save(key, model, features, labels, {"seed": seed})
+
+
+def test_round_trip(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    model, _ = _save(registry, "a", seed=1)
+    loaded, features, labels, metadata = registry.load("a")
+    assert metadata["seed"] == 1
+    assert features.shape == (20, 6) and labels.shape == (20, 1)
+    for name, value in model.state_dict().items():
+        assert torch.equal(loaded.state_dict()[name], value)
+    assert registry.load("missing") is None
+
+
+def test_corrupted_entry_is_discarded(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    _, path = _save(registry, "a")
+    with open(path, "wb") as f:
+        f.write(b"not a checkpoint")
+    assert registry.load("a") is None
+    assert not os.path.exists(path)
+
+
+def test_incompatible_entry_is_discarded_without_touching_the_model(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    path = os.path.join(str(tmp_path), "a.pt")
+    torch.save({"state_dict": {"fc1.weight": torch.zeros(1)}}, path)
+    model = MachinePredictor()
+    before = {k: v.clone() for k, v in model.state_dict().items()}
+    assert registry.load("a", model) is None
+    assert not os.path.exists(path)
+    assert all(torch.equal(model.state_dict()[k], v) for k, v in before.items())
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    registry = ModelRegistry(str(tmp_path), max_bytes=10 ** 9)
+    paths = {key: _save(registry, key)[1] for key in ("a", "b", "c")}
+    for age, key in enumerate(("c", "a", "b")): # b é o mais antigo, c o mais recente
+        stamp = 1_000_000 - age * 1000
+        os.utime(paths[key], (stamp, stamp))
+    registry.load("b") # Usar a entrada a renova
+
+    registry.max_bytes = os.path.getsize(paths["a"]) * 2
+    registry.evict()
+    assert sorted(name for name in os.listdir(str(tmp_path))) == ["b.pt", "c.pt"]
+
+
+def test_save_keeps_the_new_entry_even_over_the_limit(tmp_path):
+    registry = ModelRegistry(str(tmp_path), max_bytes=1)
+    _save(registry, "a")
+    _save(registry, "b")
+    assert os.listdir(str(tmp_path)) == ["b.pt"]
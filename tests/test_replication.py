@@ -0,0 +1,55 @@
+# tests/test_replication.py
+
+import os
+import sys
+import subprocess
+import textwrap
+import time
+
+import pytest
+
+from src.sim.replication import ReplicationResults, student_t_quantile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("df, expected", [(1, 12.706), (2, 4.303), (4, 2.776), (9, 2.262), (30, 2.042)])
+def test_student_t_quantile_matches_table(df, expected):
+    assert round(student_t_quantile(0.975, df), 3) == expected
+
+
+def test_confidence_interval_uses_student_t():
+    results = ReplicationResults(confidence=0.95)
+    for value in (1.0, 2.0, 3.0):
+        results.add({"seed": 0, "profit_ai": value, "profit_no_ai": 0.0, "vpl_ai": value, "vpl_no_ai": 0.0})
+    mean, low, high = results.confidence_interval("vpl_diff")
+    assert mean == 2.0
+    assert high - mean == pytest.approx(4.303 / 3 ** 0.5, abs=1e-3)
+
+
+def test_early_stop_terminates_running_replications():
+    # Sementes 0 e 1 terminam na hora e já satisfazem o alvo; a 2 dormiria 60 s.
+    # O processo inteiro (incluindo a saída do interpretador) tem que acabar logo.
+    script = textwrap.dedent("""
+        import time
+        from src.sim import replication
+
+        def fake_replication(seed, *args):
+            if seed >= 2:
+                time.sleep(60)
+            return {"seed": seed, "profit_ai": 1.0, "profit_no_ai": 0.0, "vpl_ai": 1.0, "vpl_no_ai": 0.0}
+
+        replication.run_replication = fake_replication
+        replication._init_worker = lambda: None
+        if __name__ == "__main__":
+            res = replication.run_replications(3, 1, max_workers=3, target_half_width=1.0,
+                                               min_replications=2)
+            print(len(res))
+    """)
+    start = time.perf_counter()
+    done = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True,
+                          timeout=120, env=dict(os.environ, PYTHONPATH=ROOT))
+    elapsed = time.perf_counter() - start
+    assert done.returncode == 0, done.stderr
+    assert done.stdout.split() == ["2"]
+    assert elapsed < 20
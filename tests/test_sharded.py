@@ -0,0 +1,35 @@
+# tests/test_sharded.py
+
+import random
+
+from src.config import DEFAULT_CONFIG, SimulationConfig
+from src.sim.machine import create_random_machines
+from src.sim.sharded import ShardedSimulator
+from src.sim.simulator import Simulator
+
+
+def _machines(seed, config=DEFAULT_CONFIG):
+    return create_random_machines(rng=random.Random(seed), config=config)
+
+
+def _profits(logs):
+    return [profit for _, profit, _ in logs]
+
+
+def test_sharded_matches_vector():
+    sim = Simulator(_machines(7), engine="vector", seed=7)
+    sim.run(100)
+    with ShardedSimulator(_machines(7), n_workers=2, seed=7, block_days=30) as sharded:
+        sharded.run(100)
+    assert _profits(sharded.logs) == _profits(sim.logs)
+    assert sharded.stats.total_profit == sim.stats.total_profit
+
+
+def test_sharded_matches_vector_with_config():
+    config = SimulationConfig(max_fail_rate=0.1, dur_total=10)
+    sim = Simulator(_machines(1, config), engine="vector", seed=2, config=config)
+    sim.run(100)
+    with ShardedSimulator(_machines(1, config), n_workers=2, seed=2, config=config) as sharded:
+        sharded.run(60)
+        sharded.run(40)
+    assert _profits(sharded.logs) == _profits(sim.logs)
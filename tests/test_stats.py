@@ -0,0 +1,33 @@
+# tests/test_stats.py
+
+import random
+
+import numpy as np
+
+from src.sim.logger import calculate_vpl, daily_profits
+from src.sim.machine import create_random_machines
+from src.sim.simulator import Simulator
+
+
+def _run(history_days, days=1000):
+    sim = Simulator(create_random_machines(rng=random.Random(1)), engine="vector", seed=1,
+                    history_days=history_days)
+    sim.run(days)
+    return sim
+
+
+def test_streaming_stats_match_full_history():
+    sim = _run(None)
+    assert np.isclose(sim.stats.vpl, calculate_vpl(sim.logs)[-1])
+    assert np.isclose(sim.stats.total_profit, daily_profits(sim.logs).sum())
+
+
+def test_bounded_history_keeps_the_daily_series():
+    full, bounded = _run(None), _run(100)
+    assert len(bounded.logs) == 1000
+    assert np.array_equal(daily_profits(bounded.logs), daily_profits(full.logs))
+    assert np.isclose(calculate_vpl(bounded.logs)[-1], bounded.stats.vpl)
+    # Só os detalhes dos últimos 100 dias ficam guardados
+    assert list(bounded.logs[899][2]) == []
+    assert list(bounded.logs[900][2]) == list(full.logs[900][2])
+    assert len(bounded.events) == 100
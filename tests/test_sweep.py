@@ -0,0 +1,18 @@
+# tests/test_sweep.py
+
+from src.config import DEFAULT_CONFIG
+from src.nn.registry import ModelRegistry
+from src.sim.sweep import model_cache_key, grid
+
+
+def test_sweep_models_are_not_shared_with_cli(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    cli_key = registry.key(42, DEFAULT_CONFIG, collect_days=365, epochs=50, trainer="train_fast")
+    assert model_cache_key(registry, DEFAULT_CONFIG, 42, 50) != cli_key
+
+
+def test_sweep_key_ignores_fields_outside_the_model(tmp_path):
+    registry = ModelRegistry(str(tmp_path))
+    cheap, expensive, longer = grid(cost_repair_grave=[4000, 8000]) + grid(dur_total=[45])
+    assert model_cache_key(registry, cheap, 0, 50) == model_cache_key(registry, expensive, 0, 50)
+    assert model_cache_key(registry, cheap, 0, 50) != model_cache_key(registry, longer, 0, 50)